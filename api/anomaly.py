@@ -0,0 +1,238 @@
+import math
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from store import UNDATED, Snapshot, parse_day
+
+logger = logging.getLogger(__name__)
+
+# Complaint volume is tracked per (product, feature, category) and per WIB day.
+# Each series keeps an exponentially weighted moving average and variance of
+# its daily count; a day whose count lies far above the baseline of the days
+# before it is a spike.
+SeriesKey = Tuple[str, str, str]
+
+# Fields of a series key, with the label used for items without a value
+SERIES_FIELDS = (('product', 'Unknown'), ('feature', 'General'), ('category', 'Unknown'))
+
+# Weight of the newest day in the moving average (~1/alpha days of memory)
+EWMA_ALPHA = 0.2
+
+# Days a series needs before its baseline is trusted
+WARMUP_DAYS = 7
+
+# Fewer complaints than this on a day are never a spike, however quiet the
+# series usually is
+MIN_SPIKE_COUNT = 3
+
+# (minimum z-score, severity), checked in order; the last one is the threshold
+SEVERITY_LEVELS = ((6.0, 'critical'), (4.5, 'high'), (3.0, 'medium'))
+
+def severity_of(z_score: float) -> Optional[str]:
+    for threshold, severity in SEVERITY_LEVELS:
+        if z_score >= threshold:
+            return severity
+    return None
+
+class Spike(NamedTuple):
+    key: SeriesKey
+    day: int
+    observed: int
+    baseline: float
+    std: float
+    z_score: float
+
+    @property
+    def severity(self) -> str:
+        return severity_of(self.z_score) or SEVERITY_LEVELS[-1][1]
+
+class ComplaintSeries:
+    """Daily complaint counts of one series with the EWMA state after each day.
+
+    ``mean[i]``/``var[i]`` summarize days ``[0, i]``, so the baseline of day
+    ``i`` is the state after day ``i - 1``. Adding counts only marks the
+    earliest changed day; ``refresh`` then recomputes from there on, which
+    for new data is just the last few days.
+    """
+
+    __slots__ = ('first_day', 'counts', 'mean', 'var', 'spikes', 'dirty')
+
+    def __init__(self, day: int):
+        self.first_day = day
+        self.counts: List[int] = []
+        self.mean: List[float] = []
+        self.var: List[float] = []
+        self.spikes: List[Spike] = []
+        self.dirty: Optional[int] = None
+
+    def add(self, day: int, count: int):
+        if day < self.first_day:
+            self.counts[:0] = [0] * (self.first_day - day)
+            self.first_day = day
+            self.dirty = 0
+        index = day - self.first_day
+        changed = index
+        if index >= len(self.counts):
+            # The zero days filled in before ``index`` need their state too
+            changed = len(self.counts)
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.dirty = changed if self.dirty is None else min(self.dirty, changed)
+
+    def refresh(self, key: SeriesKey, alpha: float):
+        start = self.dirty
+        if start is None:
+            return
+        del self.mean[start:], self.var[start:]
+        self.spikes = [spike for spike in self.spikes if spike.day < self.first_day + start]
+
+        for index in range(start, len(self.counts)):
+            count = self.counts[index]
+            if index == 0:
+                mean, var = float(count), 0.0
+            else:
+                mean, var = self.mean[index - 1], self.var[index - 1]
+                if index >= WARMUP_DAYS and count >= MIN_SPIKE_COUNT:
+                    # Never tighter than Poisson noise around the baseline
+                    std = math.sqrt(max(var, mean, 1.0))
+                    z_score = (count - mean) / std
+                    if severity_of(z_score) is not None:
+                        self.spikes.append(Spike(key, self.first_day + index, count, mean, std, z_score))
+                diff = count - mean
+                mean += alpha * diff
+                var = (1 - alpha) * (var + alpha * diff * diff)
+            self.mean.append(mean)
+            self.var.append(var)
+        self.dirty = None
+
+class SpikeView:
+    """The spikes of one snapshot, fixed once built"""
+
+    __slots__ = ('signature', 'series', '_spikes')
+
+    def __init__(self, signature, series: int, spikes: Iterable[Spike]):
+        self.signature = signature
+        self.series = series
+        self._spikes = tuple(sorted(spikes, key=lambda spike: (-spike.day, -spike.z_score, spike.key)))
+
+    def spikes(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        product: Optional[str] = None,
+        feature: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[Spike]:
+        """Spikes within [start, end], newest and then strongest first"""
+        return [
+            spike for spike in self._spikes
+            if (start is None or spike.day >= start) and (end is None or spike.day <= end)
+            and not (product and spike.key[0] != product or feature and spike.key[1] != feature
+                     or category and spike.key[2] != category)
+        ]
+
+class SpikeDetector:
+    """Complaint spike detection kept in step with the served snapshots.
+
+    ``sync`` brings the series up to date with a snapshot. When the snapshot
+    only appended items to the one synced before (``Snapshot.appended``),
+    just those items are counted, so an ingest costs O(new items) plus the
+    recomputation of the days it touched. Anything else is rebuilt from the
+    rollup cube.
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.series: Dict[SeriesKey, ComplaintSeries] = {}
+        self.signature = None
+        self.loaded_at = None
+        self.view: Optional[SpikeView] = None
+        self._lock = threading.Lock()
+
+    def sync(self, snapshot: Snapshot) -> SpikeView:
+        """Spikes of ``snapshot``, whatever another thread synced meanwhile"""
+        with self._lock:
+            if snapshot.signature == self.signature and self.loaded_at is not None:
+                return self.view
+            stale = self.loaded_at is not None and snapshot.loaded_at < self.loaded_at
+            if not stale:
+                return self._sync(snapshot)
+        # A request still holding an older snapshot doesn't roll the shared
+        # series back; it gets spikes computed for its snapshot alone
+        return SpikeDetector(self.alpha).sync(snapshot)
+
+    def _sync(self, snapshot: Snapshot) -> SpikeView:
+        appended = snapshot.appended
+        if appended is not None and self.loaded_at is not None and appended[0] == self.signature:
+            try:
+                self._refresh(self._add_items(appended[1]))
+            except Exception as e:
+                # The series may be half updated; start over from the cube
+                logger.error(f"Error adding appended items to complaint series, rebuilding: {e}")
+                self._rebuild(snapshot)
+        else:
+            self._rebuild(snapshot)
+        self.signature = snapshot.signature
+        self.loaded_at = snapshot.loaded_at
+        self.view = SpikeView(
+            snapshot.signature, len(self.series),
+            (spike for series in self.series.values() for spike in series.spikes)
+        )
+        return self.view
+
+    def _rebuild(self, snapshot: Snapshot):
+        self.series = {}
+        try:
+            self._refresh(self._add_cube(snapshot))
+        except Exception:
+            # Leave nothing behind that a later append could build on
+            self.series = {}
+            self.signature = None
+            self.loaded_at = None
+            self.view = None
+            raise
+
+    def _refresh(self, touched: Iterable[SeriesKey]):
+        for key in touched:
+            self.series[key].refresh(key, self.alpha)
+
+    def _add(self, key: SeriesKey, day: int, count: int):
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = ComplaintSeries(day)
+        series.add(day, count)
+
+    def _add_items(self, items: Iterable[Dict[str, Any]]) -> set:
+        touched = set()
+        for item in items:
+            if item.get('type') != 'complaint':
+                continue
+            day = parse_day(item.get('date'))
+            if day == UNDATED:
+                continue
+            key = tuple(
+                default if item.get(field) is None else str(item.get(field))
+                for field, default in SERIES_FIELDS
+            )
+            self._add(key, day, 1)
+            touched.add(key)
+        return touched
+
+    def _add_cube(self, snapshot: Snapshot) -> set:
+        store = snapshot.store
+        cube = store.cube
+        cells = cube.select(undated=False, type='complaint')
+        labels = {
+            field: [store[field].label(code, default) for code in range(len(store[field].vocab))]
+            for field, default in SERIES_FIELDS
+        }
+        for cell in cells:
+            key = tuple(labels[field][cube.codes[field][cell]] for field, _ in SERIES_FIELDS)
+            self._add(key, int(cube.date[cell]), int(cube.count[cell]))
+        return set(self.series)
+
+    def spikes(self, *args, **kwargs) -> List[Spike]:
+        """``SpikeView.spikes`` of the last synced snapshot"""
+        view = self.view
+        return view.spikes(*args, **kwargs) if view is not None else []
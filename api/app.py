@@ -1,12 +1,32 @@
 import os
 import json
+import base64
+import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
-from fastapi import FastAPI, HTTPException, Query
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple, Union
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from collections import Counter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+import numpy as np
+
+from anomaly import SpikeDetector
+from disposisi_store import DisposisiStore, validate as validate_disposisi
+from expert_choice import CRITERIA, normalize_weights, priority_counts, priority_of, top_k
+from binary_snapshot import BinarySnapshotLoader
+from http_cache import CachedBody, cached_response, pinned_body
+from insight import INSIGHT_FIELDS, Insight, normalize_insight
+from metrics import LATENCY_BUCKETS, SIZE_BUCKETS, MetricsMiddleware, registry
+from segment_store import SegmentLoader, compact, manifest_signature
+from sqlite_store import SqliteLoader, db_signature
+from store import (
+    GRANULARITIES, WIB, EncodedInsights, Group, Snapshot, SnapshotLoader, bucket_count, bucket_start,
+    bucket_starts, dump_json, format_bucket, format_day, shift_bucket
+)
 
 # Configure logging
 logging.basicConfig(
@@ -17,35 +37,50 @@ logger = logging.getLogger(__name__)
 
 # Environment variables
 DATA_PATH = os.getenv('DATA_PATH', '/data/insights.json')
+# "json" serves DATA_PATH, "sqlite" the database at DB_PATH and "segments"
+# the append-only segment directory at SEGMENTS_DIR
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'json').lower()
+DB_PATH = os.getenv('DB_PATH', '/data/insights.db')
+SEGMENTS_DIR = os.getenv('SEGMENTS_DIR', '/data/segments')
+# Binary snapshot kept next to DATA_PATH by the json backend ("" disables it)
+BINARY_SNAPSHOT_PATH = os.getenv('BINARY_SNAPSHOT_PATH', f"{DATA_PATH}.bin")
+# Disposisi assignments are stored here (SQLite, WAL mode)
+DISPOSISI_DB_PATH = os.getenv('DISPOSISI_DB_PATH', '/data/disposisi.db')
+# Most assignments accepted by one bulk disposisi request
+MAX_BULK_DISPOSISI = int(os.getenv('MAX_BULK_DISPOSISI', 10000))
+# Seconds between compactions of the segment directory (0 disables them)
+COMPACT_INTERVAL = float(os.getenv('COMPACT_INTERVAL', 300))
 PORT = int(os.getenv('PORT', 8000))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+# Threads for loading and aggregation, kept off the event loop
+WORKER_THREADS = int(os.getenv('WORKER_THREADS', min(4, os.cpu_count() or 1)))
+# Seconds between checks of the data file (0 disables the watcher, requests
+# then check the file themselves)
+WATCH_INTERVAL = float(os.getenv('WATCH_INTERVAL', 2))
+# A changed file must stay unchanged this long before it is loaded
+RELOAD_DEBOUNCE = float(os.getenv('RELOAD_DEBOUNCE', 1))
+# Seconds between event loop lag probes for /metrics (0 disables them)
+LOOP_LAG_INTERVAL = float(os.getenv('LOOP_LAG_INTERVAL', 0.5))
+# Most buckets a trends request may fill with zero points
+MAX_TREND_BUCKETS = int(os.getenv('MAX_TREND_BUCKETS', 1000))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 # Pydantic models
 class HealthResponse(BaseModel):
     status: str
     time: str
-
-class Insight(BaseModel):
-    title: str
-    source: str
-    summary: str
-    type: Optional[str] = "insight"  # complaint, suggestion, insight
-    product: Optional[str] = None
-    feature: Optional[str] = None
-    channel: Optional[str] = None  # BRImo, BRILink, CERIA, Qlola, MMS, Sabrina
-    social_media: Optional[str] = None  # YouTube, Instagram, Twitter, Facebook, AppStore, Playstore
-    sentiment: Optional[str] = "neutral"  # positive, neutral, negative
-    urgency_score: Optional[int] = 50
-    date: Optional[str] = None
-    category: Optional[str] = None
-    rating: Optional[int] = None  # For CSV data - star rating
-    user: Optional[str] = None  # For CSV data - reviewer name
-    
-    class Config:
-        extra = "allow"  # Allow additional fields
+    data_version: Optional[str] = None
+    items: Optional[int] = None
+    last_rebuild_at: Optional[str] = None
+    last_rebuild_seconds: Optional[float] = None
 
 class InsightsResponse(BaseModel):
     last_updated: str
     items: List[Insight]
+    total: Optional[int] = None  # matching items across all pages
+    next_cursor: Optional[str] = None
 
 class ComplaintItem(BaseModel):
     type: str
@@ -54,11 +89,19 @@ class ComplaintItem(BaseModel):
     percentage: float
     examples: List[str]
 
+class GroupItem(BaseModel):
+    value: str
+    count: int
+    percentage: float
+    priority: str
+    examples: List[str]
+
 class ComplaintsResponse(BaseModel):
     total_complaints: int
     by_type: List[ComplaintItem]
     by_product: List[ComplaintItem]
     date_range: Dict[str, str]
+    groups: Optional[Dict[str, List[GroupItem]]] = None  # extra group_by fields
 
 class SuggestionItem(BaseModel):
     type: str
@@ -72,11 +115,13 @@ class SuggestionsResponse(BaseModel):
     by_type: List[SuggestionItem]
     by_product: List[SuggestionItem]
     date_range: Dict[str, str]
+    groups: Optional[Dict[str, List[GroupItem]]] = None  # extra group_by fields
 
 class TrendPoint(BaseModel):
-    date: str
+    date: str  # first day of the bucket, YYYY-MM for months
     count: int
     sentiment_score: float
+    rolling_sentiment: Optional[float] = None  # over the trailing ``rolling`` buckets
 
 class ProductTrend(BaseModel):
     product: str
@@ -86,6 +131,7 @@ class ProductTrend(BaseModel):
 class TrendsResponse(BaseModel):
     trends: List[ProductTrend]
     date_range: Dict[str, str]
+    granularity: str = "day"
 
 class SentimentSummary(BaseModel):
     positive: int
@@ -95,6 +141,67 @@ class SentimentSummary(BaseModel):
     average_score: float
     top_keywords: List[Dict[str, Any]]
 
+class KeywordCount(BaseModel):
+    word: str
+    count: int
+
+class KeywordsResponse(BaseModel):
+    keywords: List[KeywordCount]
+    total: int  # items the keywords were counted over
+    date_range: Dict[str, str]
+
+class SearchHit(BaseModel):
+    score: float
+    item: Dict[str, Any]
+
+class SearchResponse(BaseModel):
+    query: str
+    items: List[SearchHit]
+    total: int
+    next_cursor: Optional[str] = None
+
+class PriorityItem(BaseModel):
+    score: float
+    priority: str  # high, medium, low
+    breakdown: Dict[str, int]
+    item: Dict[str, Any]
+
+class PrioritiesResponse(BaseModel):
+    items: List[PriorityItem]
+    total: int
+    counts: Dict[str, int]  # matching items per priority
+    weights: Dict[str, float]
+    as_of: str
+
+class DashboardResponse(BaseModel):
+    last_updated: str
+    total: int
+    social_media: Dict[str, int]
+    products: Dict[str, int]
+    channels: Dict[str, int]
+    sentiment: Dict[str, int]  # positive, neutral, negative
+    sentiment_score: float  # 1-5, positive=5, neutral=3, negative=1
+    positive_percentage: int
+    keywords: List[KeywordCount]
+    latest: List[Dict[str, Any]]
+    date_range: Dict[str, str]
+
+class AnomalyItem(BaseModel):
+    product: str
+    feature: str
+    category: str
+    date: str
+    observed: int  # complaints on that day
+    baseline: float  # expected complaints from the moving average
+    z_score: float
+    severity: str  # medium, high, critical
+
+class AnomaliesResponse(BaseModel):
+    anomalies: List[AnomalyItem]
+    total: int
+    series: int  # product-feature-category series being tracked
+    date_range: Dict[str, str]
+
 class DisposisiRequest(BaseModel):
     insight_id: str
     assigned_to: str
@@ -110,6 +217,706 @@ class DisposisiResponse(BaseModel):
     assigned_to: str
     division: str
 
+class BulkDisposisiResult(BaseModel):
+    index: int  # position in the request
+    status: str  # created, error
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkDisposisiResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkDisposisiResult]
+
+class DisposisiRecord(BaseModel):
+    id: str
+    insight_id: str
+    assigned_to: str
+    division: str
+    priority: str
+    due_date: str
+    notes: Optional[str] = None
+    status: str  # open, ...
+    created_at: str
+
+class DisposisiListResponse(BaseModel):
+    items: List[DisposisiRecord]
+    next_cursor: Optional[str] = None
+
+class WorkloadItem(BaseModel):
+    division: str
+    open: int
+    total: int
+    by_status: Dict[str, int]
+
+class WorkloadResponse(BaseModel):
+    divisions: List[WorkloadItem]  # most open assignments first
+    total_open: int
+
+def parse_date_range(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Convert start_date/end_date query params (YYYY-MM-DD) to day ordinals"""
+    def parse(value: Optional[str], name: str) -> Optional[int]:
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid {name}, expected YYYY-MM-DD")
+    return parse(start_date, 'start_date'), parse(end_date, 'end_date')
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma separated ``fields`` projection, None when not given"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in INSIGHT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Keep the first occurrence of each name
+    return list(dict.fromkeys(names))
+
+# Fields complaints/suggestions can be grouped by, with the label used for
+# items that don't have a value
+GROUP_FIELDS = {
+    'product': 'Unknown',
+    'feature': 'General',
+    'channel': 'Unknown',
+    'category': 'Unknown',
+    'social_media': 'Unknown'
+}
+
+def parse_group_by(group_by: Optional[str]) -> List[str]:
+    """Parse a comma separated ``group_by`` parameter"""
+    if not group_by:
+        return []
+    names = [name.strip() for name in group_by.split(',') if name.strip()]
+    unknown = [name for name in names if name not in GROUP_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot group by {', '.join(unknown)}, expected one of {', '.join(GROUP_FIELDS)}"
+        )
+    return list(dict.fromkeys(names))
+
+def parse_bulk_disposisi(body: bytes, ndjson: bool) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse and validate a JSON array or NDJSON body of disposisi.
+
+    Returns ``(record, None)`` for every valid assignment and ``(None, error)``
+    for every invalid one, in request order.
+    """
+    if ndjson:
+        raw = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw.append(json.loads(line))
+            except ValueError as e:
+                raw.append(e)
+    else:
+        try:
+            raw = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if not isinstance(raw, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of disposisi")
+    if len(raw) > MAX_BULK_DISPOSISI:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_DISPOSISI} disposisi per request")
+
+    parsed = []
+    for value in raw:
+        if isinstance(value, ValueError):
+            parsed.append((None, f"Invalid JSON: {value}"))
+            continue
+        if not isinstance(value, dict):
+            parsed.append((None, "Expected a JSON object"))
+            continue
+        try:
+            record = jsonable_encoder(DisposisiRequest(**value))
+        except ValidationError as e:
+            parsed.append((None, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )))
+            continue
+        error = validate_disposisi(record)
+        parsed.append((None, error) if error else (record, None))
+    return parsed
+
+def group_items(groups: Dict[str, List[Group]], fields: Sequence[str]) -> Optional[Dict[str, List[GroupItem]]]:
+    if not fields:
+        return None
+    return {
+        field: [
+            GroupItem(
+                value=group.value if group.value is not None else GROUP_FIELDS[field],
+                count=group.count,
+                percentage=group.percentage,
+                priority=group.priority,
+                examples=group.examples
+            )
+            for group in groups[field]
+        ]
+        for field in fields
+    }
+
+def iter_ndjson(encoded: EncodedInsights, rows: np.ndarray):
+    """Yield pre-encoded rows as NDJSON, ``STREAM_BATCH_SIZE`` lines per chunk"""
+    for lo in range(0, len(rows), STREAM_BATCH_SIZE):
+        yield encoded.join(rows[lo:lo + STREAM_BATCH_SIZE], b'\n') + b'\n'
+
+def encode_cursor(version: str, position: int) -> str:
+    """Opaque pagination cursor pointing at a row of a given snapshot version"""
+    return base64.urlsafe_b64encode(f"{version}:{position}".encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, version: str) -> int:
+    """Row position encoded in a cursor; the cursor must belong to ``version``"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        cursor_version, position = raw.rsplit(':', 1)
+        position = int(position)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_version != version:
+        raise HTTPException(status_code=410, detail="Cursor expired because the data was reloaded, restart from the first page")
+    return position
+
+def select_page(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    filters: Dict[str, Optional[str]],
+    limit: Optional[int],
+    cursor: Optional[str]
+) -> Tuple[np.ndarray, int, Optional[str]]:
+    """Rows of the requested page, total matches and the cursor of the next page"""
+    rows = snapshot.store.select(start, end, **filters)
+    total = len(rows)
+    
+    # Rows are in store order, so a cursor is simply the next row position
+    first = 0
+    if cursor:
+        first = int(np.searchsorted(rows, decode_cursor(cursor, snapshot.version)))
+    page = rows[first:] if limit is None else rows[first:first + limit]
+    next_cursor = None
+    if limit is not None and first + limit < total:
+        next_cursor = encode_cursor(snapshot.version, int(rows[first + limit]))
+    return page, total, next_cursor
+
+def build_insights(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    filters: Dict[str, Optional[str]],
+    limit: Optional[int],
+    cursor: Optional[str],
+    projection: Optional[List[str]]
+) -> Union[bytes, CachedBody]:
+    """Encoded /insights response for a page of matching rows.
+
+    Items were validated at load, so the response is sliced from their
+    pre-encoded JSON rather than built from Insight models.
+    """
+    page, total, next_cursor = select_page(snapshot, start, end, filters, limit, cursor)
+    encoded = snapshot.encoded(projection)
+    if len(page) == snapshot.store.size:
+        # Unfiltered and unpaged: the whole response is already encoded.
+        # When it is a view of a mapped binary snapshot it is served from
+        # the mapping, not copied into this worker's heap
+        return pinned_body(encoded)
+    return encoded.response(page, total, next_cursor)
+
+def build_complaints(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    group_by: List[str]
+) -> ComplaintsResponse:
+    """Get complaints analysis grouped by type and product"""
+    if not snapshot.exists:
+        return ComplaintsResponse(
+            total_complaints=0,
+            by_type=[],
+            by_product=[],
+            date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+        )
+
+    # Complaints in the date range (undated ones only without a range),
+    # grouped by every requested field in one pass
+    fields = list(dict.fromkeys(['category', 'product', *group_by]))
+    total, groups = snapshot.store.group_by(fields, examples=3, start=start, end=end, type='complaint')
+
+    # Group by type
+    by_type = [
+        ComplaintItem(
+            type=group.value or 'Unknown',
+            product="All",
+            count=group.count,
+            percentage=group.percentage,
+            examples=group.examples
+        )
+        for group in groups['category']
+    ]
+
+    # Group by product
+    by_product = [
+        ComplaintItem(
+            type="All",
+            product=group.value or 'Unknown',
+            count=group.count,
+            percentage=group.percentage,
+            examples=group.examples
+        )
+        for group in groups['product']
+    ]
+
+    return ComplaintsResponse(
+        total_complaints=total,
+        by_type=by_type,
+        by_product=by_product,
+        date_range={"start": start_date or "N/A", "end": end_date or "N/A"},
+        groups=group_items(groups, group_by)
+    )
+
+def build_suggestions(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    group_by: List[str]
+) -> SuggestionsResponse:
+    """Get suggestions analysis grouped by type and product"""
+    if not snapshot.exists:
+        return SuggestionsResponse(
+            total_suggestions=0,
+            by_type=[],
+            by_product=[],
+            date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+        )
+
+    # Suggestions in the date range (undated ones only without a range),
+    # grouped by every requested field in one pass
+    fields = list(dict.fromkeys(['category', 'product', *group_by]))
+    total, groups = snapshot.store.group_by(fields, examples=3, start=start, end=end, type='suggestion')
+
+    # Group by type, priority follows the group's urgency_score distribution
+    by_type = [
+        SuggestionItem(
+            type=group.value or 'Unknown',
+            product="All",
+            count=group.count,
+            priority=group.priority,
+            examples=group.examples
+        )
+        for group in groups['category']
+    ]
+
+    # Group by product
+    by_product = [
+        SuggestionItem(
+            type="All",
+            product=group.value or 'Unknown',
+            count=group.count,
+            priority=group.priority,
+            examples=group.examples
+        )
+        for group in groups['product']
+    ]
+
+    return SuggestionsResponse(
+        total_suggestions=total,
+        by_type=by_type,
+        by_product=by_product,
+        date_range={"start": start_date or "N/A", "end": end_date or "N/A"},
+        groups=group_items(groups, group_by)
+    )
+
+def build_trends(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    product: Optional[str],
+    granularity: str = "day",
+    fill_gaps: bool = False,
+    rolling: Optional[int] = None,
+    top_n: Optional[int] = None
+) -> TrendsResponse:
+    """Get product-feature trends over time"""
+    empty = TrendsResponse(
+        trends=[],
+        date_range={"start": start_date or "N/A", "end": end_date or "N/A"},
+        granularity=granularity
+    )
+    if not snapshot.exists:
+        return empty
+
+    # Undated items have no place on a timeline and are left out
+    daily = snapshot.store.trends
+    lo = daily.first_day if start is None else max(start, daily.first_day)
+    hi = daily.last_day if end is None else min(end, daily.last_day)
+    series = daily.select(product or None)
+    if lo > hi or not len(series):
+        return empty
+
+    if fill_gaps:
+        if bucket_count(lo, hi, granularity) > MAX_TREND_BUCKETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many {granularity} buckets to fill gaps, narrow the date range (max {MAX_TREND_BUCKETS})"
+            )
+        firsts = bucket_starts(lo, hi, granularity)
+    else:
+        # Only buckets holding items, however far apart they are
+        firsts = sorted({bucket_start(int(day), granularity) for day in daily.days_between(lo, hi)})
+
+    # Bucket b covers [starts[b], ends[b]), cut off at the date range
+    starts = np.asarray([max(first, lo) for first in firsts], dtype=np.int64)
+    ends = np.asarray([min(shift_bucket(first, granularity, 1), hi + 1) for first in firsts], dtype=np.int64)
+    if rolling:
+        # Bucket b averages over the calendar buckets [b - rolling + 1, b]
+        heads = np.asarray(
+            [max(shift_bucket(first, granularity, 1 - rolling), lo) for first in firsts], dtype=np.int64
+        )
+    else:
+        heads = starts
+    n = len(firsts)
+    count_at, sentiment_at = daily.at(series, np.concatenate([starts, ends, heads]))
+    counts = count_at[:, n:2 * n] - count_at[:, :n]
+    sentiment_sums = sentiment_at[:, n:2 * n] - sentiment_at[:, :n]
+    if rolling:
+        rolling_counts = count_at[:, n:2 * n] - count_at[:, 2 * n:]
+        rolling_sums = sentiment_at[:, n:2 * n] - sentiment_at[:, 2 * n:]
+
+    # Busiest series first; series are in product-feature order for ties
+    totals = counts.sum(axis=1)
+    order = [s for s in np.argsort(-totals, kind='stable') if totals[s] > 0]
+    if top_n is not None:
+        order = order[:top_n]
+
+    labels = [format_bucket(first, granularity) for first in firsts]
+    trends = []
+    for s in order:
+        trend_points = [
+            TrendPoint(
+                date=labels[b],
+                count=int(counts[s, b]),
+                # Sentiment score: positive=1, neutral=0, negative=-1
+                sentiment_score=round(sentiment_sums[s, b] / counts[s, b], 2) if counts[s, b] > 0 else 0,
+                rolling_sentiment=(
+                    round(rolling_sums[s, b] / rolling_counts[s, b], 2) if rolling_counts[s, b] > 0 else 0
+                ) if rolling else None
+            )
+            for b in range(len(labels))
+            if fill_gaps or counts[s, b] > 0
+        ]
+
+        trends.append(ProductTrend(
+            product=snapshot.store['product'].label(int(daily.product[series[s]]), 'Unknown'),
+            feature=snapshot.store['feature'].label(int(daily.feature[series[s]]), 'General'),
+            data=trend_points
+        ))
+
+    return TrendsResponse(
+        trends=trends,
+        date_range={"start": start_date or "N/A", "end": end_date or "N/A"},
+        granularity=granularity
+    )
+
+def build_sentiment_summary(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> SentimentSummary:
+    """Get sentiment analysis summary"""
+    if not snapshot.exists:
+        return SentimentSummary(
+            positive=0,
+            neutral=0,
+            negative=0,
+            total=0,
+            average_score=0.0,
+            top_keywords=[]
+        )
+
+    store = snapshot.store
+
+    # Apply date filter
+    cells = store.cube.select(start, end)
+    rows = store.date_slice(start, end)
+
+    # Count sentiments, missing sentiment counts as neutral
+    sentiment_counter = store.cube.value_counts('sentiment', cells)
+    positive = sentiment_counter.get('positive', 0)
+    neutral = sentiment_counter.get('neutral', 0) + sentiment_counter.get(None, 0)
+    negative = sentiment_counter.get('negative', 0)
+    total = store.cube.total(cells)
+
+    # Calculate average score (positive=1, neutral=0, negative=-1)
+    if total > 0:
+        score_sum = positive * 1 + neutral * 0 + negative * (-1)
+        average_score = round(score_sum / total, 2)
+    else:
+        average_score = 0.0
+
+    # Top title keywords, merged from the per-day keyword counts
+    top_keywords = [
+        {"word": word, "count": count}
+        for word, count in store.keywords.top(rows, 10, fields=('title',))
+    ]
+
+    return SentimentSummary(
+        positive=positive,
+        neutral=neutral,
+        negative=negative,
+        total=total,
+        average_score=average_score,
+        top_keywords=top_keywords
+    )
+
+# Text fields the keyword index covers
+KEYWORD_FIELDS = ('title', 'summary')
+
+def filtered_rows(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    filters: Dict[str, Optional[str]]
+) -> Tuple[Any, int]:
+    """Rows matching the dashboard filters and how many there are.
+
+    Without field filters this is a date slice, which lets keyword counts
+    merge the per-day totals instead of counting rows.
+    """
+    store = snapshot.store
+    if any(value is not None for value in filters.values()):
+        rows = store.select(start, end, **filters)
+        return rows, len(rows)
+    rows = store.date_slice(start, end)
+    return rows, rows.stop - rows.start
+
+def build_keywords(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    filters: Dict[str, Optional[str]],
+    fields: List[str],
+    limit: int
+) -> KeywordsResponse:
+    """Get the most frequent keywords for the word cloud"""
+    date_range = {"start": start_date or "N/A", "end": end_date or "N/A"}
+    if not snapshot.exists:
+        return KeywordsResponse(keywords=[], total=0, date_range=date_range)
+
+    store = snapshot.store
+    rows, total = filtered_rows(snapshot, start, end, filters)
+    return KeywordsResponse(
+        keywords=[
+            KeywordCount(word=word, count=count)
+            for word, count in store.keywords.top(rows, limit, fields=fields)
+        ],
+        total=total,
+        date_range=date_range
+    )
+
+def build_search(
+    snapshot: Snapshot,
+    query: str,
+    start: Optional[int],
+    end: Optional[int],
+    filters: Dict[str, Optional[str]],
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[List[str]]
+) -> bytes:
+    """Encoded /api/search response for one page of BM25 ranked matches"""
+    store = snapshot.store
+    rows, scores = store.search.search(
+        query,
+        keep=lambda candidates: store.matches(candidates, start, end, **filters)
+    )
+    total = len(rows)
+
+    # Results are ranked, so the cursor is the rank of the next hit
+    first = decode_cursor(cursor, snapshot.version) if cursor else 0
+    page = slice(first, first + limit)
+    next_cursor = encode_cursor(snapshot.version, first + limit) if first + limit < total else None
+
+    encoded = snapshot.encoded(projection)
+    hits = b','.join(
+        b'{"score":' + dump_json(round(float(score), 4)) + b',"item":' + encoded.row(int(row)) + b'}'
+        for row, score in zip(rows[page], scores[page])
+    )
+    return (
+        b'{"query":' + dump_json(query) + b',"items":[' + hits
+        + b'],"total":' + str(total).encode() + b',"next_cursor":' + dump_json(next_cursor) + b'}'
+    )
+
+def build_priorities(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    filters: Dict[str, Optional[str]],
+    weights: Dict[str, float],
+    today: int,
+    k: int
+) -> PrioritiesResponse:
+    """Top ``k`` insights by Expert Choice score, with each score's breakdown"""
+    store = snapshot.store
+    rows = store.select(start, end, **filters)
+    scores, breakdown = store.expert_choice.score(rows, weights, today)
+
+    # Rounded like the dashboard shows them, so the levels agree with it
+    rounded = np.round(scores)
+    best = top_k(scores, k)
+    return PrioritiesResponse(
+        items=[
+            PriorityItem(
+                score=round(float(scores[i]), 2),
+                priority=priority_of(float(rounded[i])),
+                breakdown={name: int(round(float(breakdown[name][i]))) for name in CRITERIA},
+                item=store.items[int(rows[i])]
+            )
+            for i in best
+        ],
+        total=len(rows),
+        counts=priority_counts(rounded),
+        weights=weights,
+        as_of=format_day(today)
+    )
+
+def build_dashboard(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    filters: Dict[str, Optional[str]],
+    keywords: int,
+    latest: int
+) -> DashboardResponse:
+    """Every dashboard widget for one filter set"""
+    date_range = {"start": start_date or "N/A", "end": end_date or "N/A"}
+    store = snapshot.store
+
+    # Chart counts come from the rollup cube, not from the rows
+    cells = store.cube.select(start, end, **filters)
+    total = store.cube.total(cells)
+
+    def counts(field: str) -> Dict[str, int]:
+        return {
+            value: count
+            for value, count in store.cube.value_counts(field, cells).items()
+            if value is not None and count
+        }
+
+    # Anything not positive or negative is shown as neutral
+    sentiment = {'positive': 0, 'neutral': 0, 'negative': 0}
+    for value, count in store.cube.value_counts('sentiment', cells).items():
+        label = value.lower() if isinstance(value, str) else None
+        sentiment[label if label in ('positive', 'negative') else 'neutral'] += count
+    sentiment_score = 0.0
+    positive_percentage = 0
+    if total:
+        score = (sentiment['positive'] * 5 + sentiment['neutral'] * 3 + sentiment['negative'] * 1) / total
+        sentiment_score = round(score, 1)
+        positive_percentage = round(sentiment['positive'] / total * 100)
+
+    rows, _ = filtered_rows(snapshot, start, end, filters)
+    top_keywords = store.keywords.top(rows, keywords, KEYWORD_FIELDS)
+    if isinstance(rows, slice):
+        rows = np.arange(rows.start, rows.stop)
+    # Newest first; rows are date-sorted with the undated ones last
+    dated = rows[rows < store.dated]
+    newest = np.concatenate([dated[::-1], rows[rows >= store.dated]])[:latest]
+
+    return DashboardResponse(
+        last_updated=snapshot.last_updated,
+        total=total,
+        social_media=counts('social_media'),
+        products=counts('product'),
+        channels=counts('channel'),
+        sentiment=sentiment,
+        sentiment_score=sentiment_score,
+        positive_percentage=positive_percentage,
+        keywords=[
+            KeywordCount(word=word, count=count)
+            for word, count in top_keywords
+        ],
+        latest=[store.items[int(row)] for row in newest],
+        date_range=date_range
+    )
+
+def build_anomalies(
+    snapshot: Snapshot,
+    start: Optional[int],
+    end: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    filters: Dict[str, Optional[str]],
+    limit: int
+) -> AnomaliesResponse:
+    """Get complaint volume spikes"""
+    view = spike_detector.sync(snapshot)
+    spikes = view.spikes(start, end, **filters)
+    return AnomaliesResponse(
+        anomalies=[
+            AnomalyItem(
+                product=spike.key[0],
+                feature=spike.key[1],
+                category=spike.key[2],
+                date=format_day(spike.day),
+                observed=spike.observed,
+                baseline=round(spike.baseline, 2),
+                z_score=round(spike.z_score, 2),
+                severity=spike.severity
+            )
+            for spike in spikes[:limit]
+        ],
+        total=len(spikes),
+        series=view.series,
+        date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+    )
+
+# Parsing the data file and building responses is CPU bound and would stall
+# the event loop (and with it /healthz), so it runs on a bounded pool
+executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="berinsight-worker")
+
+async def offload(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call on the worker pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+# Parsed and validated once per file version and shared by all endpoints
+if STORAGE_BACKEND == 'sqlite':
+    snapshot_loader = SnapshotLoader(
+        DB_PATH, normalize=normalize_insight, load=SqliteLoader(), signature=db_signature
+    )
+elif STORAGE_BACKEND == 'segments':
+    snapshot_loader = SnapshotLoader(
+        SEGMENTS_DIR, normalize=normalize_insight, load=SegmentLoader(), signature=manifest_signature
+    )
+elif STORAGE_BACKEND == 'json' and BINARY_SNAPSHOT_PATH:
+    snapshot_loader = SnapshotLoader(
+        DATA_PATH, normalize=normalize_insight, load=BinarySnapshotLoader(BINARY_SNAPSHOT_PATH)
+    )
+elif STORAGE_BACKEND == 'json':
+    snapshot_loader = SnapshotLoader(DATA_PATH, normalize=normalize_insight)
+else:
+    raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, expected json, sqlite or segments")
+
+# Complaint series kept up to date with each loaded snapshot
+spike_detector = SpikeDetector()
+
+disposisi_store = DisposisiStore(DISPOSISI_DB_PATH)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="BerInsight API",
@@ -124,145 +931,222 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Last-Updated", "X-Total-Count", "X-Next-Cursor"],
+)
+
+# Metrics served by /metrics
+app.add_middleware(
+    MetricsMiddleware,
+    requests=registry.counter(
+        'berinsight_http_requests_total', 'HTTP requests by method, route and status',
+        ('method', 'route', 'status')
+    ),
+    latency=registry.histogram(
+        'berinsight_http_request_duration_seconds', 'Time to serve a request, including streaming the body',
+        LATENCY_BUCKETS, ('method', 'route')
+    ),
+    size=registry.histogram(
+        'berinsight_http_response_size_bytes', 'Response body size as sent, after compression',
+        SIZE_BUCKETS, ('method', 'route')
+    )
+)
+snapshot_rebuild_seconds = registry.histogram(
+    'berinsight_snapshot_rebuild_seconds', 'Time to load a new data version and build its indexes'
+)
+snapshot_loader.on_rebuild = snapshot_rebuild_seconds.observe
+event_loop_lag = registry.histogram(
+    'berinsight_event_loop_lag_seconds', 'How late the event loop woke up a sleeping task'
+)
+
+def snapshot_gauge(read: Callable[[Snapshot], float]) -> Callable[[], Dict[Tuple[str, ...], Optional[float]]]:
+    def gauge() -> Dict[Tuple[str, ...], Optional[float]]:
+        snapshot = snapshot_loader.current
+        return {(): read(snapshot) if snapshot is not None else None}
+    return gauge
+
+registry.gauge(
+    'berinsight_snapshot_items', 'Items in the snapshot being served',
+    snapshot_gauge(lambda snapshot: len(snapshot.items))
+)
+registry.gauge(
+    'berinsight_snapshot_loaded_timestamp_seconds', 'When the snapshot being served was loaded (Unix time)',
+    snapshot_gauge(lambda snapshot: snapshot.loaded_at.timestamp())
+)
+registry.gauge(
+    'berinsight_snapshot_last_rebuild_seconds', 'Duration of the most recent rebuild',
+    lambda: {(): snapshot_loader.last_rebuild_seconds}
+)
+registry.gauge(
+    'berinsight_response_cache_entries', 'Responses cached for the snapshot being served',
+    snapshot_gauge(lambda snapshot: len(snapshot.responses))
 )
+registry.gauge(
+    'berinsight_response_cache_bytes', 'Bytes of cached responses for the snapshot being served',
+    snapshot_gauge(lambda snapshot: snapshot.responses.weight)
+)
+
+async def watch_data_file():
+    """Rebuild the snapshot in the background whenever the data file changes"""
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL)
+        try:
+            if await offload(snapshot_loader.refresh, RELOAD_DEBOUNCE):
+                await offload(spike_detector.sync, snapshot_loader.current)
+        except Exception as e:
+            logger.error(f"Error reloading data: {e}")
+
+async def compact_segments():
+    """Periodically merge small segments written by ingests"""
+    while True:
+        await asyncio.sleep(COMPACT_INTERVAL)
+        try:
+            await offload(compact, SEGMENTS_DIR)
+        except Exception as e:
+            logger.error(f"Error compacting segments: {e}")
+
+async def measure_event_loop_lag():
+    """Sleep repeatedly and record how much later than asked the loop woke us"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        event_loop_lag.observe(max(loop.time() - started - LOOP_LAG_INTERVAL, 0.0))
+
+background_tasks: List[asyncio.Task] = []
 
 @app.on_event("startup")
 async def startup_event():
     """Log startup information"""
     logger.info(f"Starting BerInsight API on port {PORT}")
-    logger.info(f"Data path: {DATA_PATH}")
+    logger.info(f"Storage backend: {STORAGE_BACKEND}, data path: {snapshot_loader.path}")
     
     # Check if data file exists
-    if os.path.exists(DATA_PATH):
-        logger.info(f"Data file exists at {DATA_PATH}")
+    if os.path.exists(snapshot_loader.path):
+        logger.info(f"Data file exists at {snapshot_loader.path}")
+        # Parse up front so the first request doesn't pay for it
+        await offload(spike_detector.sync, await offload(snapshot_loader.get))
     else:
-        logger.warning(f"Data file not found at {DATA_PATH}")
+        logger.warning(f"Data file not found at {snapshot_loader.path}")
+    # Opens (and if needed creates) the database before the first POST
+    await offload(disposisi_store.start)
+
+    if WATCH_INTERVAL > 0:
+        snapshot_loader.watching = True
+        background_tasks.append(asyncio.create_task(watch_data_file()))
+    if STORAGE_BACKEND == 'segments' and COMPACT_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(compact_segments()))
+    if LOOP_LAG_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(measure_event_loop_lag()))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    while background_tasks:
+        background_tasks.pop().cancel()
+    snapshot_loader.watching = False
+    # Commits whatever is still queued
+    await offload(disposisi_store.close)
 
 @app.get("/healthz", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint, including which data version is being served"""
+    snapshot = snapshot_loader.current
+    rebuilt_at = snapshot_loader.last_rebuild_at
     return HealthResponse(
         status="ok",
-        time=datetime.now(timezone.utc).isoformat()
+        time=datetime.now(timezone.utc).isoformat(),
+        data_version=snapshot.version if snapshot is not None else None,
+        items=len(snapshot.items) if snapshot is not None else None,
+        last_rebuild_at=rebuilt_at.isoformat() if rebuilt_at is not None else None,
+        last_rebuild_seconds=round(snapshot_loader.last_rebuild_seconds, 3) if snapshot_loader.last_rebuild_seconds is not None else None
     )
 
+@app.get("/metrics")
+async def get_metrics():
+    """Metrics in the Prometheus text format"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/insights", response_model=InsightsResponse)
-async def get_insights():
-    """Get insights data from persistent storage"""
+async def get_insights(
+    request: Request,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    channel: Optional[str] = Query(None),
+    social_media: Optional[str] = Query(None),
+    sentiment: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,product,sentiment,date"),
+    stream: bool = Query(False, description="Stream items as NDJSON, same as Accept: application/x-ndjson")
+):
+    """Get insights data from persistent storage.
+
+    Items come in date order, oldest first with undated items last; items
+    of the same day keep their order in the data file. Without ``limit``
+    every matching item is returned. With ``limit`` the
+    response holds one page plus a ``next_cursor`` for the following one.
+    ``fields`` projects each item to the listed columns. In streaming mode
+    items are sent one JSON object per line as they are serialized, with the
+    envelope fields moved to ``X-*`` headers.
+    """
+    start, end = parse_date_range(start_date, end_date)
+    projection = parse_fields(fields)
+    stream = stream or NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
     try:
-        if not os.path.exists(DATA_PATH):
-            logger.warning(f"Data file not found at {DATA_PATH}, returning empty response")
+        snapshot = await offload(snapshot_loader.get)
+        if not snapshot.exists:
+            logger.warning(f"Data file not found at {snapshot_loader.path}, returning empty response")
+            if stream:
+                return Response(content=b"", media_type=NDJSON_MEDIA_TYPE, headers={"X-Last-Updated": "never"})
             return InsightsResponse(
                 last_updated="never",
                 items=[]
             )
         
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Validate data structure
-        if not isinstance(data, dict) or 'items' not in data:
-            logger.error(f"Invalid data structure in {DATA_PATH}")
-            return InsightsResponse(
-                last_updated="never",
-                items=[]
+        filters = dict(product=product, channel=channel, social_media=social_media, sentiment=sentiment)
+        if stream:
+            # Encoding a projection the first time walks every row
+            encoded, (page, total, next_cursor) = await offload(
+                lambda: (snapshot.encoded(projection), select_page(snapshot, start, end, filters, limit, cursor))
+            )
+            headers = {
+                "X-Last-Updated": snapshot.last_updated,
+                "X-Total-Count": str(total)
+            }
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+            return StreamingResponse(
+                iter_ndjson(encoded, page),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers=headers
             )
         
-        # Ensure items is a list
-        items = data.get('items', [])
-        if not isinstance(items, list):
-            items = []
-        
-        # Validate each insight item
-        validated_items = []
-        for item in items:
-            if isinstance(item, dict) and all(key in item for key in ['title', 'source', 'summary']):
-                validated_items.append(Insight(**item))
-        
-        return InsightsResponse(
-            last_updated=data.get('last_updated', 'unknown'),
-            items=validated_items
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_insights(snapshot, start, end, filters, limit, cursor, projection)
         )
         
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error in {DATA_PATH}: {e}")
-        return InsightsResponse(
-            last_updated="never",
-            items=[]
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error reading insights data: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/api/complaints")
 async def get_complaints(
+    request: Request,
     start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None)
+    end_date: Optional[str] = Query(None),
+    group_by: Optional[str] = Query(None, description="Extra fields to group by, e.g. feature,channel")
 ):
     """Get complaints analysis grouped by type and product"""
+    start, end = parse_date_range(start_date, end_date)
+    fields = parse_group_by(group_by)
     try:
-        # Load insights data
-        if not os.path.exists(DATA_PATH):
-            return ComplaintsResponse(
-                total_complaints=0,
-                by_type=[],
-                by_product=[],
-                date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
-            )
-        
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        items = data.get('items', [])
-        
-        # Filter complaints and apply date range
-        complaints = [item for item in items if item.get('type') == 'complaint']
-        
-        if start_date or end_date:
-            filtered = []
-            for complaint in complaints:
-                item_date = complaint.get('date')
-                if item_date:
-                    if start_date and item_date < start_date:
-                        continue
-                    if end_date and item_date > end_date:
-                        continue
-                filtered.append(complaint)
-            complaints = filtered
-        
-        total = len(complaints)
-        
-        # Group by type
-        type_counter = Counter(c.get('category', 'Unknown') for c in complaints)
-        by_type = [
-            ComplaintItem(
-                type=t,
-                product="All",
-                count=count,
-                percentage=round((count / total * 100), 2) if total > 0 else 0,
-                examples=[c['title'] for c in complaints if c.get('category') == t][:3]
-            )
-            for t, count in type_counter.most_common()
-        ]
-        
-        # Group by product
-        product_counter = Counter(c.get('product', 'Unknown') for c in complaints)
-        by_product = [
-            ComplaintItem(
-                type="All",
-                product=p,
-                count=count,
-                percentage=round((count / total * 100), 2) if total > 0 else 0,
-                examples=[c['title'] for c in complaints if c.get('product') == p][:3]
-            )
-            for p, count in product_counter.most_common()
-        ]
-        
-        return ComplaintsResponse(
-            total_complaints=total,
-            by_type=by_type,
-            by_product=by_product,
-            date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_complaints(snapshot, start, end, start_date, end_date, fields)
         )
         
     except Exception as e:
@@ -271,71 +1155,19 @@ async def get_complaints(
 
 @app.get("/api/suggestions")
 async def get_suggestions(
+    request: Request,
     start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None)
+    end_date: Optional[str] = Query(None),
+    group_by: Optional[str] = Query(None, description="Extra fields to group by, e.g. feature,channel")
 ):
     """Get suggestions analysis grouped by type and product"""
+    start, end = parse_date_range(start_date, end_date)
+    fields = parse_group_by(group_by)
     try:
-        if not os.path.exists(DATA_PATH):
-            return SuggestionsResponse(
-                total_suggestions=0,
-                by_type=[],
-                by_product=[],
-                date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
-            )
-        
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        items = data.get('items', [])
-        suggestions = [item for item in items if item.get('type') == 'suggestion']
-        
-        # Apply date filter
-        if start_date or end_date:
-            filtered = []
-            for suggestion in suggestions:
-                item_date = suggestion.get('date')
-                if item_date:
-                    if start_date and item_date < start_date:
-                        continue
-                    if end_date and item_date > end_date:
-                        continue
-                filtered.append(suggestion)
-            suggestions = filtered
-        
-        total = len(suggestions)
-        
-        # Group by type
-        type_counter = Counter(s.get('category', 'Unknown') for s in suggestions)
-        by_type = [
-            SuggestionItem(
-                type=t,
-                product="All",
-                count=count,
-                priority="medium",  # Could be calculated based on urgency_score
-                examples=[s['title'] for s in suggestions if s.get('category') == t][:3]
-            )
-            for t, count in type_counter.most_common()
-        ]
-        
-        # Group by product
-        product_counter = Counter(s.get('product', 'Unknown') for s in suggestions)
-        by_product = [
-            SuggestionItem(
-                type="All",
-                product=p,
-                count=count,
-                priority="medium",
-                examples=[s['title'] for s in suggestions if s.get('product') == p][:3]
-            )
-            for p, count in product_counter.most_common()
-        ]
-        
-        return SuggestionsResponse(
-            total_suggestions=total,
-            by_type=by_type,
-            by_product=by_product,
-            date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_suggestions(snapshot, start, end, start_date, end_date, fields)
         )
         
     except Exception as e:
@@ -344,168 +1176,232 @@ async def get_suggestions(
 
 @app.get("/api/trends")
 async def get_trends(
+    request: Request,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    product: Optional[str] = Query(None)
+    product: Optional[str] = Query(None),
+    granularity: str = Query("day", description="Bucket size: day, week or month (WIB)"),
+    fill_gaps: bool = Query(False, description="Include buckets without items as zero points"),
+    rolling: Optional[int] = Query(None, ge=1, le=365, description="Buckets in the rolling average sentiment"),
+    top_n: Optional[int] = Query(None, ge=1, description="Only the busiest product-feature series")
 ):
     """Get product-feature trends over time"""
+    start, end = parse_date_range(start_date, end_date)
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid granularity, expected one of {', '.join(GRANULARITIES)}"
+        )
     try:
-        if not os.path.exists(DATA_PATH):
-            return TrendsResponse(
-                trends=[],
-                date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_trends(
+                snapshot, start, end, start_date, end_date, product,
+                granularity, fill_gaps, rolling, top_n
             )
-        
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        items = data.get('items', [])
-        
-        # Filter by product if specified
-        if product:
-            items = [item for item in items if item.get('product') == product]
-        
-        # Group by product-feature and date
-        trends_data = {}
-        for item in items:
-            prod = item.get('product', 'Unknown')
-            feat = item.get('feature', 'General')
-            date = item.get('date', datetime.now().strftime('%Y-%m-%d'))
-            sentiment = item.get('sentiment', 'neutral')
-            
-            # Apply date filter
-            if start_date and date < start_date:
-                continue
-            if end_date and date > end_date:
-                continue
-            
-            key = f"{prod}|{feat}"
-            if key not in trends_data:
-                trends_data[key] = {}
-            
-            if date not in trends_data[key]:
-                trends_data[key][date] = {'count': 0, 'sentiment_sum': 0}
-            
-            trends_data[key][date]['count'] += 1
-            # Sentiment score: positive=1, neutral=0, negative=-1
-            sentiment_value = 1 if sentiment == 'positive' else (-1 if sentiment == 'negative' else 0)
-            trends_data[key][date]['sentiment_sum'] += sentiment_value
-        
-        # Convert to response format
-        trends = []
-        for key, dates_data in trends_data.items():
-            prod, feat = key.split('|')
-            trend_points = []
-            
-            for date, stats in sorted(dates_data.items()):
-                trend_points.append(TrendPoint(
-                    date=date,
-                    count=stats['count'],
-                    sentiment_score=round(stats['sentiment_sum'] / stats['count'], 2) if stats['count'] > 0 else 0
-                ))
-            
-            trends.append(ProductTrend(
-                product=prod,
-                feature=feat,
-                data=trend_points
-            ))
-        
-        return TrendsResponse(
-            trends=trends,
-            date_range={"start": start_date or "N/A", "end": end_date or "N/A"}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting trends: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/sentiment")
 async def get_sentiment_summary(
+    request: Request,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None)
 ):
     """Get sentiment analysis summary"""
+    start, end = parse_date_range(start_date, end_date)
     try:
-        if not os.path.exists(DATA_PATH):
-            return SentimentSummary(
-                positive=0,
-                neutral=0,
-                negative=0,
-                total=0,
-                average_score=0.0,
-                top_keywords=[]
-            )
-        
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        items = data.get('items', [])
-        
-        # Apply date filter
-        if start_date or end_date:
-            filtered = []
-            for item in items:
-                item_date = item.get('date')
-                if item_date:
-                    if start_date and item_date < start_date:
-                        continue
-                    if end_date and item_date > end_date:
-                        continue
-                filtered.append(item)
-            items = filtered
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_sentiment_summary(snapshot, start, end, start_date, end_date)
+        )
         
-        # Count sentiments
-        sentiment_counter = Counter(item.get('sentiment', 'neutral') for item in items)
-        positive = sentiment_counter.get('positive', 0)
-        neutral = sentiment_counter.get('neutral', 0)
-        negative = sentiment_counter.get('negative', 0)
-        total = len(items)
+    except Exception as e:
+        logger.error(f"Error getting sentiment summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/keywords")
+async def get_keywords(
+    request: Request,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    channel: Optional[str] = Query(None),
+    social_media: Optional[str] = Query(None),
+    sentiment: Optional[str] = Query(None),
+    fields: str = Query(','.join(KEYWORD_FIELDS), description="Text fields to count, title and/or summary"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Get top keywords for the dashboard word cloud"""
+    start, end = parse_date_range(start_date, end_date)
+    text_fields = [name.strip() for name in fields.split(',') if name.strip()]
+    if not text_fields or any(name not in KEYWORD_FIELDS for name in text_fields):
+        raise HTTPException(status_code=400, detail=f"fields must be a subset of {', '.join(KEYWORD_FIELDS)}")
+    filters = dict(product=product, channel=channel, social_media=social_media, sentiment=sentiment)
+    try:
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_keywords(snapshot, start, end, start_date, end_date, filters, text_fields, limit)
+        )
         
-        # Calculate average score (positive=1, neutral=0, negative=-1)
-        if total > 0:
-            score_sum = positive * 1 + neutral * 0 + negative * (-1)
-            average_score = round(score_sum / total, 2)
-        else:
-            average_score = 0.0
+    except Exception as e:
+        logger.error(f"Error getting keywords: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/search", response_model=SearchResponse)
+async def search_insights(
+    request: Request,
+    q: str = Query(..., min_length=1, description='Words that must all appear; quote a "phrase" to match it exactly'),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    channel: Optional[str] = Query(None),
+    social_media: Optional[str] = Query(None),
+    sentiment: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return for each item")
+):
+    """Full-text search over title and summary, best matches first"""
+    start, end = parse_date_range(start_date, end_date)
+    projection = parse_fields(fields)
+    filters = dict(product=product, channel=channel, social_media=social_media, sentiment=sentiment)
+    try:
+        snapshot = await offload(snapshot_loader.get)
+        if not snapshot.exists:
+            return SearchResponse(query=q, items=[], total=0)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_search(snapshot, q, start, end, filters, limit, cursor, projection)
+        )
         
-        # Extract top keywords (simplified - count words in titles)
-        all_words = []
-        for item in items:
-            title = item.get('title', '')
-            words = [w.lower() for w in title.split() if len(w) > 3]
-            all_words.extend(words)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching insights: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/priorities", response_model=PrioritiesResponse)
+async def get_priorities(
+    request: Request,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    channel: Optional[str] = Query(None),
+    social_media: Optional[str] = Query(None),
+    sentiment: Optional[str] = Query(None),
+    k: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    w_sentiment: Optional[float] = Query(None, ge=0),
+    w_urgency: Optional[float] = Query(None, ge=0),
+    w_engagement: Optional[float] = Query(None, ge=0),
+    w_recency: Optional[float] = Query(None, ge=0),
+    w_impact: Optional[float] = Query(None, ge=0)
+):
+    """Get the highest priority insights by Expert Choice score.
+
+    Criterion weights default to the ones in EXPERT_CHOICE_SYSTEM.md and are
+    rescaled to sum to 1, so scores stay on a 0-100 scale.
+    """
+    start, end = parse_date_range(start_date, end_date)
+    try:
+        weights = normalize_weights(dict(
+            sentiment=w_sentiment, urgency=w_urgency, engagement=w_engagement,
+            recency=w_recency, impact=w_impact
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filters = dict(product=product, channel=channel, social_media=social_media, sentiment=sentiment)
+    today = datetime.now(WIB).date().toordinal()
+    try:
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_priorities(snapshot, start, end, filters, weights, today, k),
+            vary=str(today)
+        )
         
-        word_counter = Counter(all_words)
-        top_keywords = [
-            {"word": word, "count": count}
-            for word, count in word_counter.most_common(10)
-        ]
+    except Exception as e:
+        logger.error(f"Error getting priorities: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    channel: Optional[str] = Query(None),
+    social_media: Optional[str] = Query(None),
+    sentiment: Optional[str] = Query(None),
+    keywords: int = Query(50, ge=1, le=500, description="Number of word cloud keywords"),
+    latest: int = Query(6, ge=0, le=100, description="Number of latest insights")
+):
+    """Get every dashboard widget for the given filters in one response"""
+    start, end = parse_date_range(start_date, end_date)
+    filters = dict(product=product, channel=channel, social_media=social_media, sentiment=sentiment)
+    try:
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_dashboard(snapshot, start, end, start_date, end_date, filters, keywords, latest)
+        )
         
-        return SentimentSummary(
-            positive=positive,
-            neutral=neutral,
-            negative=negative,
-            total=total,
-            average_score=average_score,
-            top_keywords=top_keywords
+    except Exception as e:
+        logger.error(f"Error getting dashboard: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/anomalies", response_model=AnomaliesResponse)
+async def get_anomalies(
+    request: Request,
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    feature: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get days on which complaints about a product-feature-category jumped.
+
+    Each series' daily complaint count is compared with an exponentially
+    weighted moving average of the days before it; counts several standard
+    deviations above that baseline are reported, newest first.
+    """
+    start, end = parse_date_range(start_date, end_date)
+    filters = dict(product=product, feature=feature, category=category)
+    try:
+        snapshot = await offload(snapshot_loader.get)
+        return await offload(
+            cached_response, request, snapshot,
+            lambda: build_anomalies(snapshot, start, end, start_date, end_date, filters, limit)
         )
         
     except Exception as e:
-        logger.error(f"Error getting sentiment summary: {e}")
+        logger.error(f"Error getting anomalies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/disposisi")
 async def create_disposisi(request: DisposisiRequest):
     """Create disposisi assignment to PO/Division"""
+    record = jsonable_encoder(request)
+    error = validate_disposisi(record)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
     try:
-        # In production, this would save to database
-        # For now, we'll just return a success response
-        disposisi_id = f"DISP-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # Resolves once the group commit holding this record is on disk
+        stored, = await asyncio.wrap_future(await offload(disposisi_store.add, [record]))
         
-        logger.info(f"Creating disposisi: {disposisi_id} for {request.assigned_to}")
+        logger.info(f"Created disposisi: {stored['id']} for {request.assigned_to}")
         
         return DisposisiResponse(
-            id=disposisi_id,
+            id=stored['id'],
             status="created",
             message=f"Disposisi berhasil dibuat dan dikirim ke {request.assigned_to}",
             assigned_to=request.assigned_to,
@@ -516,6 +1412,96 @@ async def create_disposisi(request: DisposisiRequest):
         logger.error(f"Error creating disposisi: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/disposisi/bulk", response_model=BulkDisposisiResponse)
+async def create_disposisi_bulk(request: Request):
+    """Create many disposisi assignments in one request.
+
+    Takes a JSON array of DisposisiRequest objects, or one object per line
+    with Content-Type application/x-ndjson. Every valid assignment is written
+    in a single transaction; invalid ones are reported without failing the rest.
+    """
+    body = await request.body()
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get('content-type', '')
+    parsed = await offload(parse_bulk_disposisi, body, ndjson)
+    records = [record for record, _ in parsed if record is not None]
+    try:
+        stored = await asyncio.wrap_future(await offload(disposisi_store.add, records)) if records else []
+    except Exception as e:
+        logger.error(f"Error creating {len(records)} disposisi: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    logger.info(f"Created {len(stored)} disposisi in bulk, rejected {len(parsed) - len(stored)}")
+
+    results = []
+    ids = iter(record['id'] for record in stored)
+    for index, (record, error) in enumerate(parsed):
+        if record is None:
+            results.append(BulkDisposisiResult(index=index, status="error", error=error))
+        else:
+            results.append(BulkDisposisiResult(index=index, status="created", id=next(ids)))
+    return BulkDisposisiResponse(created=len(stored), failed=len(parsed) - len(stored), results=results)
+
+@app.get("/api/disposisi", response_model=DisposisiListResponse)
+async def list_disposisi(
+    division: Optional[str] = Query(None),
+    assigned_to: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    due_from: Optional[str] = Query(None, description="Earliest due date, YYYY-MM-DD"),
+    due_to: Optional[str] = Query(None, description="Latest due date, YYYY-MM-DD"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
+):
+    """List disposisi assignments, newest first"""
+    parse_date_range(due_from, due_to)
+    filters = dict(division=division, assigned_to=assigned_to, priority=priority, status=status)
+    try:
+        records, next_cursor = await offload(
+            disposisi_store.list, filters,
+            due_from[:10] if due_from else None, due_to[:10] if due_to else None,
+            limit, cursor
+        )
+        return DisposisiListResponse(items=records, next_cursor=next_cursor)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing disposisi: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/disposisi/workload", response_model=WorkloadResponse)
+async def get_disposisi_workload():
+    """Get open and total disposisi per division, for balancing assignments"""
+    try:
+        counts = await offload(disposisi_store.workload)
+    except Exception as e:
+        logger.error(f"Error getting disposisi workload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    divisions = [
+        WorkloadItem(
+            division=division,
+            open=by_status.get('open', 0),
+            total=sum(by_status.values()),
+            by_status=by_status
+        )
+        for division, by_status in counts.items()
+    ]
+    divisions.sort(key=lambda item: (-item.open, item.division))
+    return WorkloadResponse(divisions=divisions, total_open=sum(item.open for item in divisions))
+
+@app.get("/api/disposisi/{disposisi_id}", response_model=DisposisiRecord)
+async def get_disposisi(disposisi_id: str):
+    """Get a stored disposisi assignment by id"""
+    try:
+        record = await offload(disposisi_store.get, disposisi_id)
+    except Exception as e:
+        logger.error(f"Error reading disposisi {disposisi_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Disposisi {disposisi_id} not found")
+    return DisposisiRecord(**record)
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -529,7 +1515,16 @@ async def root():
             "suggestions": "/api/suggestions",
             "trends": "/api/trends",
             "sentiment": "/api/sentiment",
-            "disposisi": "/api/disposisi (POST)"
+            "keywords": "/api/keywords",
+            "search": "/api/search",
+            "dashboard": "/api/dashboard",
+            "priorities": "/api/priorities",
+            "anomalies": "/api/anomalies",
+            "disposisi": "/api/disposisi (POST)",
+            "disposisi_bulk": "/api/disposisi/bulk (POST)",
+            "disposisi_list": "/api/disposisi",
+            "disposisi_workload": "/api/disposisi/workload",
+            "metrics": "/metrics"
         }
     }
 
@@ -0,0 +1,305 @@
+"""
+Binary columnar snapshot of a loaded data file, for near-instant startup.
+
+After parsing insights.json the API writes every array it derived (columns,
+rollup cube, keyword and search indexes, Expert Choice criteria) plus the
+pre-encoded items into one file next to the data. Later starts, other
+uvicorn workers and reloads of an unchanged file map that file instead of
+parsing JSON: arrays are ``np.frombuffer`` views of the mapping, so nothing
+is copied and the page cache is shared between processes.
+
+Layout: MAGIC, a little-endian uint64 header length, a JSON header and the
+arrays, each starting on an ALIGNMENT boundary. The header records the
+stat signature of the JSON file the snapshot was built from; a snapshot
+whose source no longer matches is ignored and rewritten.
+
+Usage (e.g. after an ingest, to spare the API the first parse):
+    python binary_snapshot.py [--json /data/insights.json] [--out /data/insights.json.bin]
+"""
+import os
+import json
+import mmap
+import uuid
+import struct
+import logging
+import argparse
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from expert_choice import ExpertChoiceScores
+from store import (
+    CATEGORICAL_FIELDS, CategoricalColumn, DailySeries, EncodedInsights, FileSignature,
+    InsightStore, Normalizer, RollupCube, Snapshot, UNDATED, file_signature, load_snapshot
+)
+from text_index import InvertedIndex, KeywordIndex, TokenColumn
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BERSNAP1'
+# Bumped whenever the stored arrays or the way they are derived change
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+class LazyItems(Sequence):
+    """Items decoded on access from their pre-encoded JSON rows"""
+
+    def __init__(self, encoded: EncodedInsights):
+        self.encoded = encoded
+
+    def __len__(self) -> int:
+        return len(self.encoded.starts)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return json.loads(bytes(self.encoded.row(row)))
+
+class LazyField(Sequence):
+    """One field of LazyItems, e.g. the titles used for group examples"""
+
+    def __init__(self, items: LazyItems, field: str):
+        self.items = items
+        self.field = field
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return str(self.items[row].get(self.field, ''))
+
+def _collect(snapshot: Snapshot) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Arrays and JSON metadata needed to rebuild the snapshot's store"""
+    store = snapshot.store
+    encoded = snapshot.encoded()
+    arrays: Dict[str, np.ndarray] = {
+        'date': store.date,
+        'urgency': store.urgency,
+        'rating': store.rating,
+        'encoded.body': np.frombuffer(encoded.body, dtype=np.uint8),
+        'encoded.starts': encoded.starts,
+        'encoded.ends': encoded.ends,
+    }
+    meta: Dict[str, Any] = {
+        'size': store.size,
+        'dated': store.dated,
+        'prefix_length': len(encoded.prefix),
+        'vocab': {field: column.vocab for field, column in store.columns.items()},
+    }
+    for field, column in store.columns.items():
+        arrays[f'columns.{field}'] = column.codes
+
+    cube = store.cube
+    arrays.update({'cube.date': cube.date, 'cube.count': cube.count,
+                   'cube.urgency_sum': cube.urgency_sum, 'cube.urgent_count': cube.urgent_count})
+    for field, codes in cube.codes.items():
+        arrays[f'cube.codes.{field}'] = codes
+
+    keywords = store.keywords
+    meta['terms'] = keywords.terms
+    arrays['keywords.keyword'] = keywords.keyword
+    arrays['keywords.bounds'] = keywords.bounds
+    for field, column in keywords.columns.items():
+        arrays[f'keywords.{field}.offsets'] = column.offsets
+        arrays[f'keywords.{field}.ids'] = column.ids
+        # Per-day counts flattened: bucket b is [day_offsets[b], day_offsets[b + 1])
+        buckets = keywords.day_counts[field]
+        arrays[f'keywords.{field}.day_ids'] = np.concatenate([ids for ids, _ in buckets]) if buckets else np.zeros(0, dtype=np.int32)
+        arrays[f'keywords.{field}.day_counts'] = np.concatenate([counts for _, counts in buckets]) if buckets else np.zeros(0, dtype=np.int64)
+        arrays[f'keywords.{field}.day_offsets'] = np.cumsum([0] + [len(ids) for ids, _ in buckets]).astype(np.int64)
+
+    search = store.search
+    meta['search'] = {'k1': search.k1, 'b': search.b, 'avg_doc_len': search.avg_doc_len}
+    arrays.update({'search.rows': search.rows, 'search.tf': search.tf,
+                   'search.offsets': search.offsets, 'search.doc_len': search.doc_len})
+
+    for name, values in store.expert_choice.static.items():
+        arrays[f'expert_choice.{name}'] = values
+    return arrays, meta
+
+def write_binary_snapshot(path: str, snapshot: Snapshot, source: FileSignature):
+    """Write ``snapshot`` atomically to ``path``, tagged with its source file's signature"""
+    arrays, meta = _collect(snapshot)
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = [array.dtype.str, len(array), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({
+        'format': FORMAT_VERSION,
+        'source': list(source),
+        'last_updated': snapshot.last_updated,
+        'meta': meta,
+        'arrays': layout,
+    }, ensure_ascii=False).encode('utf-8')
+    # Arrays start at the first aligned offset after the header
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name][2])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _read_header(buffer) -> Tuple[Dict[str, Any], int]:
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary snapshot")
+    (length,) = struct.unpack_from('<Q', buffer, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + length]))
+    if header.get('format') != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot format {header.get('format')}")
+    return header, -(-(start + length) // ALIGNMENT) * ALIGNMENT
+
+def _restore_store(arrays: Dict[str, np.ndarray], meta: Dict[str, Any], encoded: EncodedInsights) -> InsightStore:
+    """Assemble an InsightStore around mapped arrays without recomputing anything"""
+    store = InsightStore.__new__(InsightStore)
+    store.items = LazyItems(encoded)
+    store.size = meta['size']
+    store.date = arrays['date']
+    store.dated = meta['dated']
+    store.urgency = arrays['urgency']
+    store.rating = arrays['rating']
+    store.titles = LazyField(store.items, 'title')
+    store.summaries = LazyField(store.items, 'summary')
+
+    store.columns = {}
+    for field in CATEGORICAL_FIELDS:
+        column = CategoricalColumn.__new__(CategoricalColumn)
+        column.vocab = meta['vocab'][field]
+        column.index = {value: code for code, value in enumerate(column.vocab)}
+        column.codes = arrays[f'columns.{field}']
+        store.columns[field] = column
+
+    cube = RollupCube.__new__(RollupCube)
+    cube.store = store
+    cube.date = arrays['cube.date']
+    cube.size = len(cube.date)
+    cube.dated = int(np.searchsorted(cube.date, UNDATED, side='left'))
+    cube.codes = {field: arrays[f'cube.codes.{field}'] for field in CATEGORICAL_FIELDS}
+    cube.count = arrays['cube.count']
+    cube.urgency_sum = arrays['cube.urgency_sum']
+    cube.urgent_count = arrays['cube.urgent_count']
+    store.cube = cube
+
+    keywords = KeywordIndex.__new__(KeywordIndex)
+    keywords.terms = meta['terms']
+    keywords.term_ids = {term: term_id for term_id, term in enumerate(keywords.terms)}
+    keywords.keyword = arrays['keywords.keyword']
+    keywords.bounds = arrays['keywords.bounds']
+    keywords.columns = {}
+    keywords.day_counts = {}
+    for field in ('title', 'summary'):
+        keywords.columns[field] = TokenColumn(arrays[f'keywords.{field}.offsets'], arrays[f'keywords.{field}.ids'])
+        offsets = arrays[f'keywords.{field}.day_offsets']
+        ids, counts = arrays[f'keywords.{field}.day_ids'], arrays[f'keywords.{field}.day_counts']
+        keywords.day_counts[field] = [
+            (ids[offsets[b]:offsets[b + 1]], counts[offsets[b]:offsets[b + 1]])
+            for b in range(len(offsets) - 1)
+        ]
+    store.keywords = keywords
+
+    search = InvertedIndex.__new__(InvertedIndex)
+    search.keywords = keywords
+    search.size = store.size
+    search.k1 = meta['search']['k1']
+    search.b = meta['search']['b']
+    search.avg_doc_len = meta['search']['avg_doc_len']
+    search.rows = arrays['search.rows']
+    search.tf = arrays['search.tf']
+    search.offsets = arrays['search.offsets']
+    search.doc_len = arrays['search.doc_len']
+    store.search = search
+
+    expert_choice = ExpertChoiceScores.__new__(ExpertChoiceScores)
+    expert_choice.size = store.size
+    expert_choice.date = store.date
+    expert_choice.dated = store.dated
+    expert_choice.static = {
+        name[len('expert_choice.'):]: array for name, array in arrays.items() if name.startswith('expert_choice.')
+    }
+    store.expert_choice = expert_choice
+
+    # Small compared to the rows, so rebuilt from the cube instead of stored
+    store.trends = DailySeries(store)
+    return store
+
+def read_binary_snapshot(path: str, signature: FileSignature) -> Optional[Snapshot]:
+    """Map a binary snapshot, None if it is missing or was built from another file version"""
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    header, data_start = _read_header(buffer)
+    if signature is None or header['source'] != list(signature):
+        return None
+
+    arrays = {
+        name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+        for name, (dtype, count, offset) in header['arrays'].items()
+    }
+    meta = header['meta']
+    body = memoryview(buffer)[data_start + header['arrays']['encoded.body'][2]:][:len(arrays['encoded.body'])]
+    encoded = EncodedInsights.from_buffer(
+        body, arrays['encoded.starts'], arrays['encoded.ends'], meta['prefix_length']
+    )
+    store = _restore_store(arrays, meta, encoded)
+    return Snapshot(signature, header['last_updated'], store.items, store=store, encoded=encoded)
+
+class BinarySnapshotLoader:
+    """JSON loader that keeps a binary snapshot of each parsed file.
+
+    Maps the snapshot when it matches the data file and falls back to
+    parsing JSON (then writing a fresh snapshot) when it doesn't.
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+
+    def __call__(self, path: str, signature: FileSignature, normalize: Optional[Normalizer] = None) -> Snapshot:
+        try:
+            snapshot = read_binary_snapshot(self.snapshot_path, signature)
+        except ValueError as e:
+            logger.warning(f"Ignoring binary snapshot {self.snapshot_path}: {e}")
+            snapshot = None
+        if snapshot is not None:
+            logger.info(f"Mapped binary snapshot {self.snapshot_path}")
+            return snapshot
+
+        snapshot = load_snapshot(path, signature, normalize)
+        if snapshot.exists:
+            try:
+                write_binary_snapshot(self.snapshot_path, snapshot, signature)
+            except OSError as e:
+                logger.warning(f"Could not write binary snapshot {self.snapshot_path}: {e}")
+        return snapshot
+
+def main():
+    from app import normalize_insight
+
+    parser = argparse.ArgumentParser(description="Build the binary snapshot of insights.json")
+    parser.add_argument('--json', default=os.getenv('DATA_PATH', '/data/insights.json'))
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    out = args.out or f"{args.json}.bin"
+    signature = file_signature(args.json)
+    if signature is None:
+        raise FileNotFoundError(args.json)
+    snapshot = load_snapshot(args.json, signature, normalize_insight)
+    write_binary_snapshot(out, snapshot, signature)
+    logger.info(f"Wrote binary snapshot of {len(snapshot.items)} items to {out}")
+
+if __name__ == "__main__":
+    main()
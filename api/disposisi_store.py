@@ -0,0 +1,259 @@
+import os
+import uuid
+import queue
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# Writes queued while a commit is in flight are committed together, up to
+# this many records per transaction
+GROUP_COMMIT_MAX = int(os.getenv('GROUP_COMMIT_MAX', 1000))
+# How long the writer waits for more records before committing a batch
+GROUP_COMMIT_WINDOW = float(os.getenv('GROUP_COMMIT_WINDOW_MS', 2)) / 1000
+
+FIELDS = ('insight_id', 'assigned_to', 'division', 'priority', 'due_date', 'notes')
+
+PRIORITIES = ('low', 'medium', 'high', 'critical')
+
+# ``seq`` is the rowid, assigned in commit order, so it orders listings; ids
+# only have second resolution and records added within one second (a whole
+# bulk request) would otherwise come back in random order
+SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS disposisi (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    insight_id TEXT NOT NULL,
+    assigned_to TEXT NOT NULL,
+    division TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    notes TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS disposisi_counts (
+    division TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (division, status)
+);
+""" + "".join(
+    # Listings are newest first, so every filter index ends with the seq
+    f"CREATE INDEX IF NOT EXISTS idx_disposisi_{column} ON disposisi({column}, seq);\n"
+    for column in ('division', 'assigned_to', 'priority', 'status', 'due_date')
+) + """
+CREATE TRIGGER IF NOT EXISTS disposisi_count_insert AFTER INSERT ON disposisi BEGIN
+    INSERT INTO disposisi_counts (division, status, count) VALUES (NEW.division, NEW.status, 1)
+    ON CONFLICT(division, status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS disposisi_count_update AFTER UPDATE OF division, status ON disposisi BEGIN
+    UPDATE disposisi_counts SET count = count - 1 WHERE division = OLD.division AND status = OLD.status;
+    INSERT INTO disposisi_counts (division, status, count) VALUES (NEW.division, NEW.status, 1)
+    ON CONFLICT(division, status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS disposisi_count_delete AFTER DELETE ON disposisi BEGIN
+    UPDATE disposisi_counts SET count = count - 1 WHERE division = OLD.division AND status = OLD.status;
+END;
+COMMIT;
+"""
+
+# Filters accepted by ``DisposisiStore.list`` as exact matches
+FILTER_COLUMNS = ('division', 'assigned_to', 'priority', 'status')
+
+COLUMNS = ('id',) + FIELDS + ('status', 'created_at')
+
+def validate(record: Dict[str, Any]) -> Optional[str]:
+    """Why a disposisi can't be stored, None if it can"""
+    for field in ('insight_id', 'assigned_to', 'division'):
+        if not str(record.get(field) or '').strip():
+            return f"{field} must not be empty"
+    if record.get('priority') not in PRIORITIES:
+        return f"Invalid priority, expected one of {', '.join(PRIORITIES)}"
+    try:
+        date.fromisoformat(str(record.get('due_date'))[:10])
+    except ValueError:
+        return "Invalid due_date, expected YYYY-MM-DD"
+    return None
+
+def new_id(now: datetime) -> str:
+    """Readable id; the random part keeps ids from one second apart"""
+    return f"DISP-{now.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12]}"
+
+def connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    """Writer connection, creating the schema if needed, or a read-only one"""
+    if readonly:
+        conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Every commit is fsynced before the POST that caused it returns
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.executescript(SCHEMA)
+    return conn
+
+class DisposisiStore:
+    """Disposisi records in a SQLite database (WAL), written with group commits.
+
+    ``add`` only queues the record. A single writer thread takes everything
+    queued so far and inserts it in one transaction, so concurrent requests
+    share one fsync instead of paying for one each. Reads use their own
+    connections and never wait for the writer.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.Queue[Tuple[List[Dict[str, Any]], Future]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Open the database and start the writer thread, unless it is running"""
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                conn = connect(self.path)
+                self._writer = threading.Thread(
+                    target=self._write_loop, args=(conn,), name="disposisi-writer", daemon=True
+                )
+                self._writer.start()
+
+    def add(self, records: List[Dict[str, Any]]) -> Future:
+        """Queue new records for the next group commit.
+
+        Ids, status and timestamps are assigned here. The returned future
+        resolves to the stored records once their transaction committed.
+        """
+        now = datetime.now(timezone.utc)
+        stored = [
+            dict(record, id=new_id(now), status='open', created_at=now.isoformat())
+            for record in records
+        ]
+        future: Future = Future()
+        self.start()
+        self._queue.put((stored, future))
+        return future
+
+    def _write_loop(self, conn: sqlite3.Connection):
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                break
+            size = len(batch[0][0])
+            stop = False
+            # Collect whatever else arrives within the window
+            while size < GROUP_COMMIT_MAX:
+                try:
+                    entry = self._queue.get(timeout=GROUP_COMMIT_WINDOW)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+                size += len(entry[0])
+            self._commit(conn, batch)
+            if stop:
+                break
+        conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[List[Dict[str, Any]], Future]]):
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO disposisi ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    (tuple(record.get(column) for column in COLUMNS) for records, _ in batch for record in records)
+                )
+        except Exception as e:
+            if len(batch) > 1:
+                # Don't let one bad write fail the others it was batched with
+                for entry in batch:
+                    self._commit(conn, [entry])
+                return
+            logger.error(f"Error committing disposisi write: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for records, future in batch:
+            future.set_result(records)
+
+    def close(self):
+        """Commit what is queued and stop the writer thread"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # The writer's connection creates the database and its schema
+            self.start()
+            conn = self._local.conn = connect(self.path, readonly=True)
+        return conn
+
+    def get(self, disposisi_id: str) -> Optional[Dict[str, Any]]:
+        row = self._reader().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM disposisi WHERE id = ?", (disposisi_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def list(
+        self,
+        filters: Dict[str, Optional[str]],
+        due_from: Optional[str] = None,
+        due_to: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Matching records, newest first, and the id to continue after.
+
+        Pages are keyed on the seq of that id rather than an offset, so each
+        page is an index range scan no matter how deep it is and concurrent
+        inserts don't shift it. An ``after`` id that doesn't exist raises
+        ValueError.
+        """
+        conn = self._reader()
+        clauses, params = [], []
+        for column in FILTER_COLUMNS:
+            if filters.get(column):
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if due_from:
+            clauses.append("due_date >= ?")
+            params.append(due_from)
+        if due_to:
+            # due_date may carry a time after the day
+            clauses.append("due_date < ?")
+            params.append(f"{due_to}~")
+        if after:
+            row = conn.execute("SELECT seq FROM disposisi WHERE id = ?", (after,)).fetchone()
+            if row is None:
+                raise ValueError("Invalid cursor")
+            clauses.append("seq < ?")
+            params.append(row['seq'])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM disposisi {where} ORDER BY seq DESC LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+        records = [dict(row) for row in rows[:limit]]
+        return records, records[-1]['id'] if len(rows) > limit else None
+
+    def workload(self) -> Dict[str, Dict[str, int]]:
+        """Number of disposisi per division and status, read from the running counts"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in self._reader().execute(
+            "SELECT division, status, count FROM disposisi_counts WHERE count > 0 ORDER BY division, status"
+        ):
+            counts.setdefault(row['division'], {})[row['status']] = row['count']
+        return counts
@@ -0,0 +1,124 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Expert Choice (MCDA) scoring, see EXPERT_CHOICE_SYSTEM.md. Every criterion
+# scores 0-100 and the final score is their weighted sum.
+CRITERIA = ('sentiment', 'urgency', 'engagement', 'recency', 'impact')
+
+DEFAULT_WEIGHTS = {
+    'sentiment': 0.30,
+    'urgency': 0.25,
+    'engagement': 0.20,
+    'recency': 0.15,
+    'impact': 0.10,
+}
+
+SENTIMENT_SCORES = {'negative': 90, 'neutral': 50, 'positive': 20}
+DEFAULT_SENTIMENT_SCORE = 50
+
+URGENCY_KEYWORDS = ('urgent', 'critical', 'issue', 'problem', 'error', 'failed', 'broken', 'crash', 'bug', 'security')
+URGENCY_POINTS = 20
+
+IMPACT_KEYWORDS = ('system', 'security', 'data', 'customer', 'revenue', 'user', 'feature', 'integration', 'performance')
+IMPACT_POINTS = 15
+
+# Words for a full engagement score
+ENGAGEMENT_WORDS = 50
+
+# Recency points lost per day since the insight was posted
+RECENCY_DECAY = 2
+
+# (minimum score, priority), checked in order
+PRIORITY_LEVELS = ((70, 'high'), (40, 'medium'), (0, 'low'))
+
+def priority_of(score: float) -> str:
+    for threshold, priority in PRIORITY_LEVELS:
+        if score >= threshold:
+            return priority
+    return PRIORITY_LEVELS[-1][1]
+
+def priority_counts(scores: np.ndarray) -> Dict[str, int]:
+    """Number of scores falling in each priority level"""
+    counts = {}
+    upper = np.inf
+    for threshold, priority in PRIORITY_LEVELS:
+        counts[priority] = int(np.count_nonzero((scores >= threshold) & (scores < upper)))
+        upper = threshold
+    return counts
+
+class ExpertChoiceScores:
+    """Per-row Expert Choice criteria, computed as whole-column operations.
+
+    Everything except recency depends only on the item, so those criteria are
+    scored once per snapshot; recency is derived from the day ordinals when
+    scoring for a given day.
+    """
+
+    def __init__(self, store):
+        self.size = store.size
+        self.date = store.date
+        self.dated = store.dated
+
+        sentiment = store.columns['sentiment']
+        scores = {
+            value: SENTIMENT_SCORES.get(value.lower(), DEFAULT_SENTIMENT_SCORE)
+            for value in sentiment.vocab if isinstance(value, str)
+        }
+        self.static: Dict[str, np.ndarray] = {
+            'sentiment': sentiment.lookup(scores, DEFAULT_SENTIMENT_SCORE, dtype=np.float64)[sentiment.codes]
+        }
+
+        # Keyword checks are plain substring tests on the lowercased text,
+        # matching how the dashboard has always scored them
+        contents = [f"{title} {summary}".lower() for title, summary in zip(store.titles, store.summaries)]
+        urgency = np.zeros(self.size)
+        impact = np.zeros(self.size)
+        words = np.zeros(self.size)
+        for row, content in enumerate(contents):
+            urgency[row] = sum(keyword in content for keyword in URGENCY_KEYWORDS)
+            impact[row] = sum(keyword in content for keyword in IMPACT_KEYWORDS)
+            words[row] = len(content.split(' '))
+        self.static['urgency'] = np.minimum(urgency * URGENCY_POINTS, 100)
+        self.static['engagement'] = np.minimum(words / ENGAGEMENT_WORDS * 100, 100)
+        self.static['impact'] = np.minimum(impact * IMPACT_POINTS, 100)
+
+    def recency(self, rows: np.ndarray, today: int) -> np.ndarray:
+        """Recency criterion as of day ordinal ``today``; undated rows score 0"""
+        days = today - self.date[rows].astype(np.int64)
+        scores = np.clip(100 - days * RECENCY_DECAY, 0, 100).astype(np.float64)
+        scores[rows >= self.dated] = 0
+        return scores
+
+    def score(self, rows: np.ndarray, weights: Dict[str, float], today: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Weighted scores of ``rows`` plus each criterion's scores"""
+        breakdown = {name: column[rows] for name, column in self.static.items()}
+        breakdown['recency'] = self.recency(rows, today)
+        total = np.zeros(len(rows))
+        for name in CRITERIA:
+            total += breakdown[name] * weights[name]
+        return total, breakdown
+
+def normalize_weights(weights: Dict[str, Optional[float]]) -> Dict[str, float]:
+    """Fill in default weights and rescale them to sum to 1.
+
+    Raises ValueError for negative weights or when all weights are zero.
+    """
+    merged = {name: DEFAULT_WEIGHTS[name] if weights.get(name) is None else float(weights[name]) for name in CRITERIA}
+    if any(weight < 0 for weight in merged.values()):
+        raise ValueError("weights must not be negative")
+    total = sum(merged.values())
+    if total <= 0:
+        raise ValueError("at least one weight must be positive")
+    return {name: weight / total for name, weight in merged.items()}
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` highest scores, best first (ties keep row order)"""
+    if k < len(scores):
+        # Partial selection, only the k winners get sorted
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))[:k]
+    return candidates[order]
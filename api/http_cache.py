@@ -0,0 +1,201 @@
+import os
+import gzip
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from metrics import registry
+from store import EncodedInsights, Snapshot, dump_json
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = int(os.getenv('MIN_COMPRESS_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 5))
+# Bodies that are views of a mapped file are sent in chunks of this size
+BODY_CHUNK_SIZE = 1024 * 1024
+
+# Preferred first when the client accepts several
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+cache_requests = registry.counter(
+    'berinsight_response_cache_requests_total',
+    'Cached GET responses by outcome: hit, miss or not_modified (304)',
+    ('result',)
+)
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class CachedBody:
+    """Encoded response body with lazily computed compressed variants.
+
+    Lives in the snapshot's response cache, so each variant is compressed at
+    most once per data version no matter how often it is requested. ``body``
+    may be a memoryview of a mapped binary snapshot, which is never copied.
+
+    A body that isn't ``owned`` belongs to the snapshot (see ``pinned_body``)
+    and lives as long as the snapshot does, compressed variants included, so
+    none of it counts against the response cache.
+    """
+
+    def __init__(self, body: Union[bytes, memoryview], media_type: str = "application/json", owned: bool = True):
+        self.body = body
+        self.media_type = media_type
+        self.owned = owned
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def variant(self, encoding: Optional[str]) -> Union[bytes, memoryview]:
+        if encoding is None:
+            return self.body
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            with self._lock:
+                compressed = self._variants.get(encoding)
+                if compressed is None:
+                    compressed = self._variants[encoding] = compress(self.body, encoding)
+        return compressed
+
+    @property
+    def size(self) -> int:
+        """Bytes this body owns, compressed variants included"""
+        if not self.owned:
+            return 0
+        return len(self.body) + sum(len(variant) for variant in list(self._variants.values()))
+
+_pin_lock = threading.Lock()
+
+def pinned_body(encoded: EncodedInsights) -> CachedBody:
+    """The full response of ``encoded`` with its compressed variants, kept alongside it.
+
+    These are the largest responses there are; pinning them to the encoded
+    items instead of the byte-bounded response cache means they are never
+    evicted (and recompressed) while the snapshot is served.
+    """
+    with _pin_lock:
+        if encoded.cached_body is None:
+            encoded.cached_body = CachedBody(encoded.body, owned=False)
+        return encoded.cached_body
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag of one Content-Encoding of a response; identity keeps ``etag``"""
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def request_key(request: Request) -> str:
+    """Path plus canonical (sorted) query string"""
+    query = '&'.join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+def make_etag(version: str, key: str) -> str:
+    """Strong ETag for a request against a given data version"""
+    digest = hashlib.blake2b(f"{version}|{key}".encode('utf-8'), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def matching_etag(request: Request, etag: str) -> Optional[str]:
+    """The variant of ``etag`` listed in If-None-Match, None if there is none.
+
+    Any encoding's variant matches, since they all carry the same content;
+    comparison is weak, as RFC 9110 asks.
+    """
+    header = request.headers.get('if-none-match')
+    if not header:
+        return None
+    variants = {variant_etag(etag, encoding) for encoding in (None,) + SUPPORTED_ENCODINGS}
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return etag
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in variants:
+            return candidate
+    return None
+
+def choose_encoding(request: Request, size: int) -> Optional[str]:
+    """Best supported Content-Encoding the client accepts, None for identity"""
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    accepted = {}
+    for token in request.headers.get('accept-encoding', '').split(','):
+        name, _, params = token.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+def iter_chunks(body: memoryview) -> Iterator[bytes]:
+    for start in range(0, len(body), BODY_CHUNK_SIZE):
+        yield bytes(body[start:start + BODY_CHUNK_SIZE])
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+def cached_response(request: Request, snapshot: Snapshot, build: Callable[[], Any], vary: str = '') -> Response:
+    """Serve a GET response from the snapshot's response cache.
+
+    ``build`` runs only on a cache miss and may return raw JSON bytes, a
+    pydantic model or a ``pinned_body``. Requests carrying a matching If-None-Match get a 304
+    without touching the cache at all. ``vary`` keys responses that also
+    depend on something besides the data and the query, such as the day.
+    """
+    key = request_key(request)
+    if vary:
+        key = f"{key}#{vary}"
+    etag = make_etag(snapshot.version, key)
+    matched = matching_etag(request, etag)
+    if matched is not None:
+        cache_requests.inc('not_modified')
+        return not_modified(matched)
+
+    built = False
+
+    def encode() -> CachedBody:
+        nonlocal built
+        built = True
+        body = build()
+        if isinstance(body, CachedBody):
+            return body
+        if isinstance(body, BaseModel):
+            body = dump_json(jsonable_encoder(body))
+        return CachedBody(body)
+
+    cached = snapshot.responses.get_or_build(key, encode)
+    cache_requests.inc('miss' if built else 'hit')
+    encoding = choose_encoding(request, len(cached.body))
+    headers = {"ETag": variant_etag(etag, encoding), "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    size = cached.size
+    content = cached.variant(encoding)
+    if cached.size != size:
+        # A variant was just compressed
+        snapshot.responses.reweigh(key)
+    if not isinstance(content, bytes):
+        headers["Content-Length"] = str(len(content))
+        return StreamingResponse(iter_chunks(content), media_type=cached.media_type, headers=headers)
+    return Response(content=content, media_type=cached.media_type, headers=headers)
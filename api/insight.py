@@ -0,0 +1,41 @@
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+class Insight(BaseModel):
+    title: str
+    source: str
+    summary: str
+    type: Optional[str] = "insight"  # complaint, suggestion, insight
+    product: Optional[str] = None
+    feature: Optional[str] = None
+    channel: Optional[str] = None  # BRImo, BRILink, CERIA, Qlola, MMS, Sabrina
+    social_media: Optional[str] = None  # YouTube, Instagram, Twitter, Facebook, AppStore, Playstore
+    sentiment: Optional[str] = "neutral"  # positive, neutral, negative
+    urgency_score: Optional[int] = 50
+    date: Optional[str] = None
+    category: Optional[str] = None
+    rating: Optional[int] = None  # For CSV data - star rating
+    user: Optional[str] = None  # For CSV data - reviewer name
+    
+    class Config:
+        extra = "allow"  # Allow additional fields
+
+# Declared Insight fields, the names accepted by ``fields=`` projections
+INSIGHT_FIELDS = list(getattr(Insight, 'model_fields', None) or Insight.__fields__)
+
+REQUIRED_INSIGHT_FIELDS = ['title', 'source', 'summary']
+
+def normalize_insight(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Validate a raw item against Insight, returning its JSON-ready form"""
+    if not all(key in item for key in REQUIRED_INSIGHT_FIELDS):
+        return None
+    try:
+        return jsonable_encoder(Insight(**item))
+    except ValidationError as e:
+        logger.debug(f"Dropping invalid insight {item.get('title')!r}: {e}")
+        return None
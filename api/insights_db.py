@@ -0,0 +1,110 @@
+"""
+SQLite storage of insights: one row per item, written in transactions.
+
+Shared by the scraper, which adds rows, and the API, which loads them
+(sqlite_store.py). Standard library only, since the scraper image installs
+nothing else. Set DB_PATH to have the scraper write here.
+
+Rows are only ever added through ``write_items``, so ids grow with every
+ingest. Replacing everything bumps the ``generation`` in the meta table;
+while it stays the same, rows past the last id a reader saw are exactly the
+items added since.
+"""
+
+import os
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Tuple
+
+DB_PATH = os.getenv('DB_PATH', '')
+
+# Insight fields stored as their own columns; anything else an item carries
+# goes into the ``extra`` JSON column
+COLUMNS = (
+    'title', 'source', 'summary', 'type', 'product', 'feature', 'channel',
+    'social_media', 'sentiment', 'urgency_score', 'date', 'category', 'rating', 'user'
+)
+
+# Columns the dashboard filters and groups by
+INDEXED_COLUMNS = ('date', 'product', 'type', 'sentiment', 'channel')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS insights (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    type TEXT,
+    product TEXT,
+    feature TEXT,
+    channel TEXT,
+    social_media TEXT,
+    sentiment TEXT,
+    urgency_score INTEGER,
+    date TEXT,
+    category TEXT,
+    rating INTEGER,
+    "user" TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+""" + "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_insights_{column} ON insights({column});\n"
+    for column in INDEXED_COLUMNS
+)
+
+_COLUMN_LIST = ', '.join(f'"{column}"' for column in COLUMNS)
+
+def connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn = sqlite3.connect(path)
+    # Readers keep loading while an ingest commits
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _row_values(item: Dict[str, Any]) -> Tuple[Any, ...]:
+    extra = {key: value for key, value in item.items() if key not in COLUMNS}
+    return tuple(item.get(column) for column in COLUMNS) + (
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value)
+    )
+
+def write_items(conn: sqlite3.Connection, items: Iterable[Dict[str, Any]], last_updated: str, replace: bool = False) -> int:
+    """Insert items in one transaction, optionally replacing everything stored"""
+    with conn:
+        if replace:
+            conn.execute("DELETE FROM insights")
+            generation = int(read_meta(conn).get('generation', 0)) + 1
+            _set_meta(conn, 'generation', str(generation))
+        cursor = conn.executemany(
+            f"INSERT INTO insights ({_COLUMN_LIST}, extra) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+            (_row_values(item) for item in items)
+        )
+        _set_meta(conn, 'last_updated', last_updated)
+    return cursor.rowcount
+
+def read_meta(conn: sqlite3.Connection) -> Dict[str, str]:
+    return dict(conn.execute("SELECT key, value FROM meta"))
+
+def read_items(conn: sqlite3.Connection, after: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+    """Items with an id past ``after`` in insertion order, and the last id read"""
+    last_id = after
+    items = []
+    for row in conn.execute(f"SELECT id, {_COLUMN_LIST}, extra FROM insights WHERE id > ? ORDER BY id", (after,)):
+        last_id = row[0]
+        item = dict(zip(COLUMNS, row[1:]))
+        if row[-1]:
+            item.update(json.loads(row[-1]))
+        items.append(item)
+    return last_id, items
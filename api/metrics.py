@@ -0,0 +1,190 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts keyed by label values, updated under
+a lock that is uncontended in practice. Gauges are read from the objects
+they describe when ``/metrics`` is scraped, so nothing is maintained for
+them in between. No client library or collector is needed; point any
+Prometheus-compatible scraper (or curl) at the endpoint.
+"""
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Request latency, event loop lag and rebuild buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Response size buckets in bytes
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values]
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (+Inf last), sum and count
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        names = self.labels + ('le',)
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+class Gauge:
+    """Value read at scrape time; ``read`` returns {label values: value}"""
+
+    type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Dict[Labels, Optional[float]]], labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.read = read
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.read().items()) if value is not None
+        ]
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS, labels: Sequence[str] = ()) -> Histogram:
+        return self._add(Histogram(name, documentation, buckets, labels))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Dict[Labels, Optional[float]]], labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, read, labels))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests, their latency and response size per route.
+
+    Routes are labelled by their path template (``/api/disposisi/{disposisi_id}``),
+    unmatched paths as ``other``, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, requests: Counter, latency: Histogram, size: Histogram):
+        self.app = app
+        self.requests = requests
+        self.latency = latency
+        self.size = size
+        self._routes: Dict[Callable, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return 'other'
+        route = self._routes.get(endpoint)
+        if route is None:
+            router = scope.get('router')
+            for candidate in getattr(router, 'routes', ()):
+                if getattr(candidate, 'endpoint', None) is endpoint:
+                    route = candidate.path
+                    break
+            route = self._routes[endpoint] = route or 'other'
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = self._route(scope)
+            method = scope['method']
+            self.requests.inc(method, route, str(status))
+            self.latency.observe(time.perf_counter() - start, method, route)
+            self.size.observe(size, method, route)
@@ -0,0 +1,56 @@
+"""
+One-shot migration of insights.json into the SQLite backend.
+
+Usage:
+    python migrate_to_sqlite.py [--json /data/insights.json] [--db /data/insights.db]
+
+Items are validated the same way the API validates them at load, one at a
+time as they are written. The database is built next to the target and
+moved into place at the end, so an API serving from it never sees a
+half-migrated table.
+"""
+import os
+import json
+import argparse
+import logging
+
+from insight import normalize_insight
+from insights_db import connect, write_items
+
+logger = logging.getLogger(__name__)
+
+def migrate(json_path: str, db_path: str) -> int:
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ValueError(f"Invalid data structure in {json_path}")
+
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = connect(tmp_path)
+    try:
+        valid = (
+            normalized for normalized in (normalize_insight(item) for item in items if isinstance(item, dict))
+            if normalized is not None
+        )
+        count = write_items(conn, valid, data.get('last_updated', 'unknown'), replace=True)
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    if count < len(items):
+        logger.warning(f"Skipped {len(items) - count} invalid items in {json_path}")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate insights.json to SQLite")
+    parser.add_argument('--json', default=os.getenv('DATA_PATH', '/data/insights.json'))
+    parser.add_argument('--db', default=os.getenv('DB_PATH', '/data/insights.db'))
+    args = parser.parse_args()
+
+    count = migrate(args.json, args.db)
+    logger.info(f"Migrated {count} items from {args.json} to {args.db}")
+
+if __name__ == "__main__":
+    main()
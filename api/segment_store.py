@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from segments import MANIFEST, manifest_lock, read_manifest, write_atomic
+from store import FileSignature, Normalizer, Snapshot, file_signature, validate_items
+
+logger = logging.getLogger(__name__)
+
+# Besides the layout in segments.py the compactor keeps
+#   retired.json   when each unreferenced segment was first seen
+RETIRED = 'retired.json'
+
+# Segments with fewer items than this get merged by the compactor
+COMPACT_MIN_ITEMS = int(os.getenv('COMPACT_MIN_ITEMS', 5000))
+# Unreferenced segment files are deleted once they are this many seconds old,
+# giving readers of an older manifest time to finish
+COMPACT_GRACE_SECONDS = float(os.getenv('COMPACT_GRACE_SECONDS', 300))
+
+def manifest_signature(directory: str) -> FileSignature:
+    """Every manifest update is a rename, so its stat identifies the data version"""
+    return file_signature(os.path.join(directory, MANIFEST))
+
+class SegmentLoader:
+    """Snapshot loader for a segments directory that only parses new segments.
+
+    Segments are immutable, so each one is read and validated once and its
+    items are kept by name. A reload reuses the cached segments listed in the
+    new manifest and only parses the ones added since; a segment produced by
+    compaction is assembled from the cached segments it was merged from.
+    The store and indexes are still rebuilt over all items.
+
+    When every previously loaded segment is still listed (directly or merged
+    into a compacted one), the snapshot records the newly parsed items as
+    ``appended`` so incremental consumers can skip the rest.
+    """
+
+    def __init__(self):
+        self._segments: Dict[str, List[Dict[str, Any]]] = {}
+        self._signature: FileSignature = None
+        self._lock = threading.Lock()
+
+    def _cached_items(self, entry: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        items = self._segments.get(entry['name'])
+        if items is not None:
+            return items
+        parts = entry.get('merged_from')
+        if parts and all(part in self._segments for part in parts):
+            return [item for part in parts for item in self._segments[part]]
+        return None
+
+    def _read_segment(self, directory: str, entry: Dict[str, Any], normalize: Optional[Normalizer]) -> List[Dict[str, Any]]:
+        path = os.path.join(directory, entry['name'])
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = [json.loads(line) for line in f if line.strip()]
+        return validate_items(raw, normalize, path)
+
+    def __call__(self, directory: str, signature: FileSignature, normalize: Optional[Normalizer] = None) -> Snapshot:
+        if signature is None:
+            return Snapshot(None, "never", [])
+
+        with self._lock:
+            manifest = read_manifest(directory)
+            segments = {}
+            added = []
+            kept = set()
+            for entry in manifest.get('segments', []):
+                items = self._cached_items(entry)
+                if items is None:
+                    items = self._read_segment(directory, entry, normalize)
+                    added.extend(items)
+                else:
+                    kept.add(entry['name'])
+                    kept.update(entry.get('merged_from', ()))
+                segments[entry['name']] = items
+            appended = None
+            if self._signature is not None and kept >= set(self._segments):
+                appended = (self._signature, added)
+            # Drop segments the manifest no longer lists
+            self._segments = segments
+            self._signature = signature
+
+        items = [item for segment in segments.values() for item in segment]
+        return Snapshot(signature, manifest.get('last_updated', 'unknown'), items, appended=appended)
+
+def compact(directory: str, min_items: int = COMPACT_MIN_ITEMS, grace: float = COMPACT_GRACE_SECONDS) -> int:
+    """Merge runs of adjacent small segments and delete unreferenced files.
+
+    Merging only concatenates lines, so item order is preserved. Returns the
+    number of segments that were merged away.
+    """
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        return 0
+
+    merged = 0
+    with manifest_lock(directory):
+        manifest = read_manifest(directory)
+        generation = manifest['generation'] + 1
+
+        # Group the segment list into runs of small segments and single large ones
+        runs: List[List[Dict[str, Any]]] = []
+        for entry in manifest['segments']:
+            small = entry['items'] < min_items
+            if small and runs and runs[-1][-1]['items'] < min_items:
+                runs[-1].append(entry)
+            else:
+                runs.append([entry])
+
+        segments = []
+        for run in runs:
+            if len(run) == 1:
+                segments.append(run[0])
+                continue
+            data = b''
+            for entry in run:
+                with open(os.path.join(directory, entry['name']), 'rb') as f:
+                    data += f.read()
+            name = f"{generation:08d}-{uuid.uuid4().hex[:8]}.jsonl"
+            write_atomic(os.path.join(directory, name), data)
+            segments.append({
+                "name": name,
+                "items": sum(entry['items'] for entry in run),
+                "merged_from": [entry['name'] for entry in run]
+            })
+            merged += len(run) - 1
+
+        if merged:
+            before = len(manifest['segments'])
+            manifest = dict(manifest, generation=generation, segments=segments)
+            write_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+            logger.info(f"Compacted {before} segments in {directory} into {len(segments)}")
+
+        # Files the manifest no longer lists are retired first and deleted
+        # only after the grace period, as a reader may still be using them.
+        # This bookkeeping lives outside the manifest so it doesn't look
+        # like new data to the API.
+        retired_path = os.path.join(directory, RETIRED)
+        try:
+            with open(retired_path, 'r', encoding='utf-8') as f:
+                seen = json.load(f)
+        except FileNotFoundError:
+            seen = {}
+        referenced = {entry['name'] for entry in segments}
+        now = time.time()
+        retired = {}
+        for name in os.listdir(directory):
+            if name.endswith('.jsonl') and name not in referenced:
+                since = seen.get(name, now)
+                if now - since >= grace:
+                    os.remove(os.path.join(directory, name))
+                else:
+                    retired[name] = since
+        if retired != seen:
+            write_atomic(retired_path, json.dumps(retired).encode('utf-8'))
+
+    return merged
@@ -0,0 +1,89 @@
+"""
+Append-only insight storage: immutable JSONL segments listed by a manifest.
+
+Layout of a segments directory:
+    manifest.json     {"generation": n, "last_updated": "...", "segments": [{"name": ..., "items": n}]}
+    <name>.jsonl      one insight per line, never modified once written
+    manifest.lock     serializes writers (ingests and the API's compactor)
+
+An ingest writes its items to a new segment and then swaps in a manifest that
+lists it, so the cost of an ingest depends only on its own size and readers
+always see a complete set of segments. Set SEGMENTS_DIR to use it.
+
+Shared by the scraper, which writes segments, and the API, which reads and
+compacts them (segment_store.py). Standard library only, since the scraper
+image installs nothing else.
+"""
+
+import os
+import json
+import fcntl
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+SEGMENTS_DIR = os.getenv('SEGMENTS_DIR', '')
+
+MANIFEST = 'manifest.json'
+LOCK = 'manifest.lock'
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"generation": 0, "last_updated": "never", "segments": []}
+
+def write_atomic(path: str, data: bytes):
+    """Write to a temporary file, fsync and rename over ``path``"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+@contextmanager
+def manifest_lock(directory: str):
+    with open(os.path.join(directory, LOCK), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def write_segment(directory: str, items: List[Dict[str, Any]], generation: int) -> Dict[str, Any]:
+    """Write items to a new immutable segment file and return its manifest entry"""
+    name = f"{generation:08d}-{uuid.uuid4().hex[:8]}.jsonl"
+    lines = ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items)
+    write_atomic(os.path.join(directory, name), lines.encode('utf-8'))
+    return {"name": name, "items": len(items)}
+
+def append_items(directory: str, items: List[Dict[str, Any]], last_updated: str, replace: bool = False) -> Dict[str, Any]:
+    """Add items as a new segment; with ``replace`` it becomes the only segment.
+
+    Segments dropped by ``replace`` stay on disk until the API's compactor
+    removes unreferenced files, so readers of the old manifest can finish.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with manifest_lock(directory):
+        manifest = read_manifest(directory)
+        generation = manifest["generation"] + 1
+        entry = write_segment(directory, items, generation)
+        segments = [] if replace else manifest["segments"]
+        manifest = dict(
+            manifest,
+            generation=generation,
+            last_updated=last_updated,
+            segments=segments + [entry]
+        )
+        write_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+    return manifest
+
+def read_items(directory: str) -> List[Dict[str, Any]]:
+    """All items of the current manifest, in ingest order"""
+    items = []
+    for segment in read_manifest(directory)["segments"]:
+        with open(os.path.join(directory, segment["name"]), 'r', encoding='utf-8') as f:
+            items.extend(json.loads(line) for line in f if line.strip())
+    return items
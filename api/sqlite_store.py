@@ -0,0 +1,82 @@
+import os
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from insights_db import connect, read_items, read_meta
+from store import FileSignature, Normalizer, Snapshot, validate_items
+
+logger = logging.getLogger(__name__)
+
+def db_signature(path: str) -> FileSignature:
+    """Stat-based identity of the database, including its write-ahead log.
+
+    Committed writes in WAL mode only touch the ``-wal`` file until the next
+    checkpoint, so both files are part of the signature.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    size, mtime_ns = st.st_size, st.st_mtime_ns
+    try:
+        wal = os.stat(f"{path}-wal")
+        size += wal.st_size
+        mtime_ns = max(mtime_ns, wal.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return (st.st_ino, size, mtime_ns)
+
+class SqliteLoader:
+    """Snapshot loader for the SQLite backend that only reads new rows.
+
+    The validated items and the last row id are kept between loads. As long
+    as the database file and its ``generation`` are the same, a reload reads
+    just the rows past that id and records them as ``appended``; a replaced
+    database is read whole. The store and indexes are still rebuilt over all
+    items.
+    """
+
+    def __init__(self):
+        self._items: List[Dict[str, Any]] = []
+        self._last_id = 0
+        self._generation: Optional[str] = None
+        self._inode: Optional[int] = None
+        self._signature: FileSignature = None
+        self._lock = threading.Lock()
+
+    def __call__(self, path: str, signature: FileSignature, normalize: Optional[Normalizer] = None) -> Snapshot:
+        if signature is None:
+            return Snapshot(None, "never", [])
+
+        with self._lock:
+            conn = connect(path, readonly=True)
+            try:
+                # One read transaction, so a concurrent ingest is either
+                # fully visible or not at all
+                with conn:
+                    conn.execute("BEGIN")
+                    meta = read_meta(conn)
+                    generation = meta.get('generation', '0')
+                    incremental = (
+                        self._signature is not None
+                        and signature[0] == self._inode and generation == self._generation
+                    )
+                    last_id, rows = read_items(conn, self._last_id if incremental else 0)
+            finally:
+                conn.close()
+
+            added = validate_items(rows, normalize, path)
+            appended = None
+            if incremental:
+                appended = (self._signature, added)
+                self._items = self._items + added
+            else:
+                self._items = added
+            self._last_id = last_id
+            self._generation = generation
+            self._inode = signature[0]
+            self._signature = signature
+            items = self._items
+
+        return Snapshot(signature, meta.get('last_updated', 'unknown'), items, appended=appended)
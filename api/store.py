@@ -0,0 +1,860 @@
+import os
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from expert_choice import ExpertChoiceScores
+from text_index import InvertedIndex, KeywordIndex
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality string fields stored as integer codes
+CATEGORICAL_FIELDS = ('type', 'product', 'feature', 'channel', 'social_media', 'sentiment', 'category')
+
+# Day key of items without a parseable date; sorts after every real date so
+# undated rows form their own bucket at the end of the store
+UNDATED = np.iinfo(np.int32).max
+
+DEFAULT_URGENCY = 50
+# Items at or above this urgency_score count as urgent
+URGENT_SCORE = 80
+MISSING_RATING = -1
+
+# Timezone of the scraper and the dashboard; dates are bucketed into WIB days
+WIB = timezone(timedelta(hours=7))
+
+# Trend bucket sizes accepted by ``bucket_starts``
+GRANULARITIES = ('day', 'week', 'month')
+
+# Sentiment score: positive=1, neutral=0, negative=-1
+SENTIMENT_VALUES = {'positive': 1, 'negative': -1}
+
+# Row selector: a contiguous slice of the store or an array of row positions
+Rows = Any
+
+# (inode, size, mtime_ns) of the data file; None when the file is missing
+FileSignature = Optional[Tuple[int, int, int]]
+
+# Validates a raw item and returns its normalized form, None to drop it
+Normalizer = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Per-snapshot caches, least recently used entries are evicted first
+MAX_ENCODED_PROJECTIONS = int(os.getenv('MAX_ENCODED_PROJECTIONS', 8))
+# Cached responses are bounded by their total size in bytes, compressed
+# variants included
+RESPONSE_CACHE_BYTES = int(os.getenv('RESPONSE_CACHE_BYTES', 64 * 1024 * 1024))
+
+def dump_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON, same format as FastAPI's JSONResponse"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def file_signature(path: str) -> FileSignature:
+    """Return the stat-based identity of the data file"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def parse_day(value: Any) -> int:
+    """Convert a YYYY-MM-DD(...) string to a day ordinal, UNDATED if invalid.
+
+    Timestamps carrying a UTC offset are converted to their WIB day; plain
+    dates and naive timestamps are already WIB.
+    """
+    if not isinstance(value, str) or len(value) < 10:
+        return UNDATED
+    if len(value) > 10 and (value.endswith('Z') or '+' in value[10:] or '-' in value[10:]):
+        try:
+            moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if moment.tzinfo is not None:
+                return moment.astimezone(WIB).date().toordinal()
+        except ValueError:
+            pass
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return UNDATED
+
+def format_day(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+def bucket_start(ordinal: int, granularity: str) -> int:
+    """First day of the day/week/month bucket containing ``ordinal``; weeks start on Monday"""
+    if granularity == 'week':
+        # Ordinal 1 (0001-01-01) is a Monday
+        return ordinal - (ordinal - 1) % 7
+    if granularity == 'month':
+        return date.fromordinal(ordinal).replace(day=1).toordinal()
+    return ordinal
+
+def shift_bucket(start: int, granularity: str, n: int) -> int:
+    """First day of the bucket ``n`` buckets after (or before) the one starting at ``start``"""
+    if granularity == 'week':
+        return start + 7 * n
+    if granularity == 'month':
+        first = date.fromordinal(start)
+        months = first.year * 12 + first.month - 1 + n
+        if months < 12:
+            return 1
+        return date(months // 12, months % 12 + 1, 1).toordinal()
+    return start + n
+
+def bucket_count(start: int, end: int, granularity: str) -> int:
+    """Number of buckets [start, end] is split into"""
+    first, last = bucket_start(start, granularity), bucket_start(end, granularity)
+    if granularity == 'week':
+        return (last - first) // 7 + 1
+    if granularity == 'month':
+        first_date, last_date = date.fromordinal(first), date.fromordinal(last)
+        return (last_date.year - first_date.year) * 12 + last_date.month - first_date.month + 1
+    return last - first + 1
+
+def bucket_starts(start: int, end: int, granularity: str) -> List[int]:
+    """First days of every bucket overlapping [start, end]"""
+    first = bucket_start(start, granularity)
+    return [shift_bucket(first, granularity, n) for n in range(bucket_count(start, end, granularity))]
+
+def format_bucket(ordinal: int, granularity: str) -> str:
+    """Label of the bucket containing ``ordinal``: its first day, YYYY-MM for months"""
+    if granularity == 'month':
+        return format_day(ordinal)[:7]
+    return format_day(bucket_start(ordinal, granularity))
+
+def _code_dtype(size: int) -> np.dtype:
+    """Smallest unsigned dtype able to hold codes for a vocabulary of this size"""
+    if size <= np.iinfo(np.uint8).max:
+        return np.dtype(np.uint8)
+    if size <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+def _to_int(value: Any, default: int) -> int:
+    """Coerce a numeric field to an int16-safe value"""
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        number = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return default
+    return max(-32768, min(32767, number))
+
+def date_window(days: np.ndarray, dated: int, start: Optional[int], end: Optional[int], undated: bool) -> slice:
+    """Slice of a day-sorted array covering [start, end].
+
+    ``days[:dated]`` are real day ordinals and ``days[dated:]`` are UNDATED.
+    Undated entries can't fall inside a date window, so they are only part of
+    an open-ended query, and only when ``undated`` is set.
+    """
+    if start is None and end is None:
+        return slice(0, len(days) if undated else dated)
+    lo = 0 if start is None else int(np.searchsorted(days[:dated], start, side='left'))
+    hi = dated if end is None else int(np.searchsorted(days[:dated], end, side='right'))
+    return slice(lo, max(lo, hi))
+
+class CategoricalColumn:
+    """Dictionary-encoded string column.
+
+    ``vocab[code]`` is the original value (None for missing) and ``codes``
+    holds one small integer per row.
+    """
+
+    def __init__(self, values: Sequence[Any]):
+        index: Dict[Optional[str], int] = {}
+        raw = np.empty(len(values), dtype=np.int64)
+        for row, value in enumerate(values):
+            if value is not None and not isinstance(value, str):
+                value = str(value)
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(index)
+            raw[row] = code
+        self.vocab: List[Optional[str]] = list(index)
+        self.index = index
+        self.codes = raw.astype(_code_dtype(len(self.vocab)))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code(self, value: Optional[str]) -> int:
+        """Code of a value, -1 if it never occurs"""
+        return self.index.get(value, -1)
+
+    def label(self, code: int, default: Optional[str] = None) -> Optional[str]:
+        value = self.vocab[code]
+        return default if value is None else value
+
+    def eq(self, value: Optional[str], rows: Rows = slice(None)) -> np.ndarray:
+        """Boolean mask over ``rows`` for ``column == value``"""
+        codes = self.codes[rows]
+        code = self.code(value)
+        if code < 0:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def counts(self, rows: Rows = slice(None)) -> np.ndarray:
+        """Number of selected rows per code"""
+        return np.bincount(self.codes[rows], minlength=len(self.vocab))
+
+    def value_counts(self, rows: Rows = slice(None)) -> Dict[Optional[str], int]:
+        """Number of selected rows per value"""
+        counts = self.counts(rows)
+        return {value: int(counts[code]) for code, value in enumerate(self.vocab)}
+
+    def lookup(self, mapping: Dict[Optional[str], Any], default: Any = 0, dtype: Any = np.int64) -> np.ndarray:
+        """Per-code array of ``mapping[value]``, for vectorized value translation"""
+        return np.array([mapping.get(value, default) for value in self.vocab], dtype=dtype)
+
+class InsightStore:
+    """Column-oriented, dictionary-encoded copy of the insight items.
+
+    Rows are kept sorted by day (stable, so file order is preserved within a
+    day) with undated rows last. A date window is therefore a contiguous
+    slice found by binary search, and aggregations only run ``np.bincount``
+    over the code arrays of the rows inside it.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]]):
+        days = np.fromiter((parse_day(item.get('date')) for item in items), dtype=np.int32, count=len(items))
+        order = np.argsort(days, kind='stable')
+        items = [items[row] for row in order]
+
+        self.items: List[Dict[str, Any]] = items
+        self.size = len(items)
+        self.date = days[order]
+        # Rows [0, dated) have a date, rows [dated, size) are undated
+        self.dated = int(np.searchsorted(self.date, UNDATED, side='left'))
+        self.columns: Dict[str, CategoricalColumn] = {
+            field: CategoricalColumn([item.get(field) for item in items])
+            for field in CATEGORICAL_FIELDS
+        }
+        self.urgency = np.fromiter(
+            (_to_int(item.get('urgency_score'), DEFAULT_URGENCY) for item in items),
+            dtype=np.int16, count=self.size
+        )
+        self.rating = np.fromiter(
+            (_to_int(item.get('rating'), MISSING_RATING) for item in items),
+            dtype=np.int16, count=self.size
+        )
+        self.titles: List[str] = [str(item.get('title', '')) for item in items]
+        self.summaries: List[str] = [str(item.get('summary', '')) for item in items]
+        self.cube = RollupCube(self)
+        # First row of every day bucket (the undated rows are the last bucket)
+        day_starts = np.flatnonzero(np.diff(self.date)) + 1 if self.size else np.zeros(0, dtype=np.int64)
+        self.keywords = KeywordIndex(
+            {'title': self.titles, 'summary': self.summaries},
+            np.insert(day_starts, 0, 0) if self.size else day_starts,
+            self.size
+        )
+        self.search = InvertedIndex(self.keywords, self.size)
+        self.expert_choice = ExpertChoiceScores(self)
+        self.trends = DailySeries(self)
+
+    def __getitem__(self, field: str) -> CategoricalColumn:
+        return self.columns[field]
+
+    @property
+    def undated(self) -> slice:
+        """Rows without a usable date"""
+        return slice(self.dated, self.size)
+
+    def date_slice(self, start: Optional[int] = None, end: Optional[int] = None, undated: bool = True) -> slice:
+        """Rows dated within [start, end] (inclusive day ordinals)"""
+        return date_window(self.date, self.dated, start, end, undated)
+
+    def select(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        undated: bool = True,
+        **equals: Optional[str]
+    ) -> np.ndarray:
+        """Positions of rows in the date window whose fields equal the given values"""
+        window = self.date_slice(start, end, undated)
+        mask = np.ones(window.stop - window.start, dtype=bool)
+        for field, value in equals.items():
+            if value is not None:
+                mask &= self.columns[field].eq(value, window)
+        return window.start + np.flatnonzero(mask)
+
+    def matches(
+        self,
+        rows: np.ndarray,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        undated: bool = True,
+        **equals: Optional[str]
+    ) -> np.ndarray:
+        """Boolean mask of which of the given rows pass a ``select`` style filter"""
+        window = self.date_slice(start, end, undated)
+        mask = (rows >= window.start) & (rows < window.stop)
+        for field, value in equals.items():
+            if value is not None:
+                mask &= self.columns[field].eq(value, rows)
+        return mask
+
+    def first_rows(
+        self,
+        wanted: Dict[str, Sequence[int]],
+        k: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        undated: bool = True,
+        chunk: int = 4096,
+        **equals: Optional[str]
+    ) -> Dict[str, Dict[int, List[int]]]:
+        """First ``k`` matching rows for each wanted code of each field.
+
+        All fields are served by one chunked scan of the date window, which
+        stops as soon as every group has ``k`` rows, so for common groups only
+        the head of the window is read.
+        """
+        found = {field: {int(code): [] for code in codes} for field, codes in wanted.items()}
+        missing = {(field, code) for field, groups in found.items() for code in groups if k > 0}
+        window = self.date_slice(start, end, undated)
+        for lo in range(window.start, window.stop, chunk):
+            if not missing:
+                break
+            part = slice(lo, min(lo + chunk, window.stop))
+            mask = np.ones(part.stop - part.start, dtype=bool)
+            for name, value in equals.items():
+                if value is not None:
+                    mask &= self.columns[name].eq(value, part)
+            positions = lo + np.flatnonzero(mask)
+            for field in wanted:
+                # Stable sort keeps row order within each code's run
+                part_codes = self.columns[field].codes[positions]
+                order = np.argsort(part_codes, kind='stable')
+                sorted_codes = part_codes[order]
+                for code, rows in found[field].items():
+                    if (field, code) not in missing:
+                        continue
+                    first = int(np.searchsorted(sorted_codes, code, side='left'))
+                    last = min(int(np.searchsorted(sorted_codes, code, side='right')), first + k - len(rows))
+                    rows.extend(int(row) for row in positions[order[first:last]])
+                    if len(rows) >= k:
+                        missing.discard((field, code))
+        return found
+
+    def group_by(
+        self,
+        fields: Sequence[str],
+        examples: int = 3,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        undated: bool = True,
+        **equals: Optional[str]
+    ) -> Tuple[int, Dict[str, List['Group']]]:
+        """Group the matching rows by each of ``fields`` at once.
+
+        Counts and urgency statistics come from the rollup cube; example
+        titles for every group of every field come from a single early-exit
+        scan of the rows. Groups are ordered by descending count, ties in
+        order of first appearance in the window.
+        """
+        for field in fields:
+            if field not in self.columns:
+                raise KeyError(field)
+        cube = self.cube
+        cells = cube.select(start, end, undated, **equals)
+        total = cube.total(cells)
+
+        stats = {}
+        for field in fields:
+            codes = cube.codes[field][cells]
+            minlength = len(self.columns[field].vocab)
+            counts = np.bincount(codes, weights=cube.count[cells], minlength=minlength)
+            urgency = np.bincount(codes, weights=cube.urgency_sum[cells], minlength=minlength)
+            urgent = np.bincount(codes, weights=cube.urgent_count[cells], minlength=minlength)
+            present, first_seen = np.unique(codes, return_index=True)
+            order = present[np.lexsort((first_seen, -counts[present]))]
+            stats[field] = (order, counts, urgency, urgent)
+
+        rows = self.first_rows(
+            {field: stats[field][0] for field in fields}, examples,
+            start=start, end=end, undated=undated, **equals
+        )
+
+        groups = {}
+        for field in fields:
+            order, counts, urgency, urgent = stats[field]
+            column = self.columns[field]
+            groups[field] = [
+                Group(
+                    value=column.vocab[code],
+                    count=int(counts[code]),
+                    percentage=round(counts[code] / total * 100, 2) if total > 0 else 0,
+                    urgency_mean=round(urgency[code] / counts[code], 2),
+                    urgent_share=round(urgent[code] / counts[code], 4),
+                    examples=[self.titles[row] for row in rows[field][int(code)]]
+                )
+                for code in order
+            ]
+        return total, groups
+
+class Group(NamedTuple):
+    """One group produced by ``InsightStore.group_by``"""
+    value: Optional[str]
+    count: int
+    percentage: float
+    urgency_mean: float
+    urgent_share: float  # share of items with urgency_score >= URGENT_SCORE
+    examples: List[str]
+
+    @property
+    def priority(self) -> str:
+        """low / medium / high / critical from the group's urgency distribution"""
+        if self.urgency_mean >= 85:
+            return "critical"
+        if self.urgency_mean >= 70 or self.urgent_share >= 0.5:
+            return "high"
+        if self.urgency_mean >= 50:
+            return "medium"
+        return "low"
+
+class RollupCube:
+    """Pre-aggregated counts over every categorical field plus the day.
+
+    One cell per distinct (date, type, product, feature, channel,
+    social_media, sentiment, category) combination, sorted by day like the
+    store, so aggregate queries sum over the cells of a date window instead
+    of over the rows.
+    """
+
+    def __init__(self, store: 'InsightStore'):
+        self.store = store
+        row_codes = [store.columns[field].codes for field in CATEGORICAL_FIELDS]
+        # Rows are already day-sorted; lexsort keeps that as the primary key
+        order = np.lexsort(tuple(reversed([store.date] + row_codes)))
+        keys = [store.date[order]] + [codes[order] for codes in row_codes]
+        if store.size:
+            changed = np.zeros(store.size, dtype=bool)
+            changed[0] = True
+            for key in keys:
+                changed[1:] |= key[1:] != key[:-1]
+            starts = np.flatnonzero(changed)
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+
+        self.size = len(starts)
+        self.date = keys[0][starts]
+        self.dated = int(np.searchsorted(self.date, UNDATED, side='left'))
+        self.codes: Dict[str, np.ndarray] = {
+            field: key[starts] for field, key in zip(CATEGORICAL_FIELDS, keys[1:])
+        }
+        self.count = np.diff(np.append(starts, store.size)).astype(np.int64)
+        self.urgency_sum = self._sum_per_cell(store.urgency[order], starts)
+        self.urgent_count = self._sum_per_cell(store.urgency[order] >= URGENT_SCORE, starts)
+
+    @staticmethod
+    def _sum_per_cell(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        if not len(starts):
+            return np.zeros(0, dtype=np.int64)
+        return np.add.reduceat(values.astype(np.int64), starts)
+
+    def select(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        undated: bool = True,
+        **equals: Optional[str]
+    ) -> np.ndarray:
+        """Positions of cells in the date window whose fields equal the given values"""
+        window = date_window(self.date, self.dated, start, end, undated)
+        mask = np.ones(window.stop - window.start, dtype=bool)
+        for field, value in equals.items():
+            if value is None:
+                continue
+            code = self.store.columns[field].code(value)
+            if code < 0:
+                return np.zeros(0, dtype=np.int64)
+            mask &= self.codes[field][window] == code
+        return window.start + np.flatnonzero(mask)
+
+    def total(self, cells: np.ndarray) -> int:
+        return int(self.count[cells].sum())
+
+    def counts(self, field: str, cells: np.ndarray) -> np.ndarray:
+        """Number of rows per code of ``field`` within the selected cells"""
+        return np.bincount(
+            self.codes[field][cells], weights=self.count[cells],
+            minlength=len(self.store.columns[field].vocab)
+        ).astype(np.int64)
+
+    def value_counts(self, field: str, cells: np.ndarray) -> Dict[Optional[str], int]:
+        counts = self.counts(field, cells)
+        return {value: int(counts[code]) for code, value in enumerate(self.store.columns[field].vocab)}
+
+    def sentiment_sums(self, cells: np.ndarray) -> np.ndarray:
+        """Summed sentiment score of the rows in each selected cell"""
+        lookup = self.store.columns['sentiment'].lookup(SENTIMENT_VALUES)
+        return lookup[self.codes['sentiment'][cells]] * self.count[cells]
+
+class DailySeries:
+    """Daily counts of every product-feature series as prefix sums.
+
+    Built from the dated cells of the rollup cube over the distinct days that
+    have items, not a dense calendar, so one stray date far from the rest
+    costs a single column. ``count[s, k]`` holds the items of series ``s``
+    dated before ``days[k]``; the total of any day range is the difference
+    of two entries found by binary search, so a query costs O(buckets) per
+    series however many items fall inside it.
+    """
+
+    def __init__(self, store: 'InsightStore'):
+        cube = store.cube
+        self.products = store['product']
+        cells = slice(0, cube.dated)
+        n_features = len(store['feature'].vocab)
+        keys = cube.codes['product'][cells].astype(np.int64) * n_features + cube.codes['feature'][cells]
+        series, index = np.unique(keys, return_inverse=True)
+        self.product = (series // n_features).astype(np.int32)
+        self.feature = (series % n_features).astype(np.int32)
+        self.size = len(series)
+
+        self.days, day_index = np.unique(cube.date[cells].astype(np.int64), return_inverse=True)
+        n_days = len(self.days)
+        slots = index.ravel() * n_days + day_index.ravel()
+        shape = (self.size, n_days)
+        daily_count = np.bincount(slots, weights=cube.count[cells], minlength=self.size * n_days)
+        daily_sentiment = np.bincount(slots, weights=cube.sentiment_sums(cells), minlength=self.size * n_days)
+        self.count = self._prefix(daily_count.reshape(shape))
+        self.sentiment = self._prefix(daily_sentiment.reshape(shape))
+
+    @staticmethod
+    def _prefix(daily: np.ndarray) -> np.ndarray:
+        prefix = np.zeros((daily.shape[0], daily.shape[1] + 1), dtype=np.int32)
+        np.cumsum(daily.astype(np.int32), axis=1, out=prefix[:, 1:])
+        return prefix
+
+    @property
+    def first_day(self) -> int:
+        return int(self.days[0]) if len(self.days) else 0
+
+    @property
+    def last_day(self) -> int:
+        return int(self.days[-1]) if len(self.days) else -1
+
+    def days_between(self, start: int, end: int) -> np.ndarray:
+        """Days within [start, end] that have items"""
+        return self.days[np.searchsorted(self.days, start, side='left'):np.searchsorted(self.days, end, side='right')]
+
+    def select(self, product: Optional[str] = None) -> np.ndarray:
+        """Positions of the series of ``product``, or of every series"""
+        if product is None:
+            return np.arange(self.size)
+        return np.flatnonzero(self.product == self.products.code(product))
+
+    def at(self, series: np.ndarray, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count and sentiment sum of each series over the days before each of ``days``"""
+        positions = np.searchsorted(self.days, days, side='left')
+        return self.count[np.ix_(series, positions)], self.sentiment[np.ix_(series, positions)]
+
+class LRUCache:
+    """Small thread-safe LRU map.
+
+    Bounded by entry count, or by total weight when ``weigh`` is given (a
+    value's size in bytes, say). Values are built outside the lock, so two
+    threads missing the same key at once may both build it; the first one
+    stored wins.
+    """
+
+    def __init__(self, max_size: int, weigh: Optional[Callable[[Any], int]] = None):
+        self.max_size = max_size
+        self.weigh = weigh or (lambda value: 1)
+        self.weight = 0
+        self._entries: 'OrderedDict[Any, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_or_build(self, key: Any, build: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = build()
+        weight = self.weigh(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            self._entries[key] = (value, weight)
+            self.weight += weight
+            self._evict()
+        return value
+
+    def reweigh(self, key: Any):
+        """Account for a cached value that has grown since it was stored"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            weight = self.weigh(entry[0])
+            self._entries[key] = (entry[0], weight)
+            self.weight += weight - entry[1]
+            self._evict()
+
+    def _evict(self):
+        # A value bigger than the whole budget isn't kept either
+        while self.weight > self.max_size and self._entries:
+            _, (_, weight) = self._entries.popitem(last=False)
+            self.weight -= weight
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class EncodedInsights:
+    """Pre-serialized /insights response for one snapshot and projection.
+
+    ``body`` is the complete unfiltered response. Every row's JSON sits inside
+    it at ``[starts[i], ends[i])``, so any page or filter result is assembled
+    by joining slices of this one buffer instead of re-encoding items.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], last_updated: str, projection: Optional[Tuple[str, ...]] = None):
+        if projection is None:
+            parts = [dump_json(item) for item in items]
+        else:
+            parts = [dump_json({name: item.get(name) for name in projection}) for item in items]
+        self.prefix = b'{"last_updated":' + dump_json(last_updated) + b',"items":['
+        lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))
+        self.ends = len(self.prefix) + np.cumsum(lengths + 1) - 1
+        self.starts = self.ends - lengths
+        self.body = b''.join([
+            self.prefix, b','.join(parts),
+            b'],"total":', str(len(parts)).encode(), b',"next_cursor":null}'
+        ])
+        self._view = memoryview(self.body)
+        # ``body`` as a response with its compressed variants, see http_cache.pinned_body
+        self.cached_body = None
+
+    @classmethod
+    def from_buffer(cls, body: Any, starts: np.ndarray, ends: np.ndarray, prefix_length: int) -> 'EncodedInsights':
+        """Wrap an already encoded full response, e.g. from a mapped binary snapshot"""
+        encoded = cls.__new__(cls)
+        encoded.body = body
+        encoded.prefix = bytes(body[:prefix_length])
+        encoded.starts = starts
+        encoded.ends = ends
+        encoded._view = memoryview(body)
+        encoded.cached_body = None
+        return encoded
+
+    def row(self, row: int) -> memoryview:
+        return self._view[self.starts[row]:self.ends[row]]
+
+    def join(self, rows: Sequence[int], separator: bytes = b',') -> bytes:
+        """Encoded rows joined by ``separator``"""
+        view, starts, ends = self._view, self.starts, self.ends
+        return separator.join([view[starts[row]:ends[row]] for row in rows])
+
+    def response(self, rows: Sequence[int], total: int, next_cursor: Optional[str]) -> bytes:
+        """Encoded response holding only the given rows"""
+        return b''.join([
+            self.prefix, self.join(rows),
+            b'],"total":', str(total).encode(), b',"next_cursor":', dump_json(next_cursor), b'}'
+        ])
+
+class Snapshot:
+    """Immutable, fully parsed view of insights.json.
+
+    Handlers grab one Snapshot per request and only read from it, so a reload
+    that happens mid-request never mixes items from two different files.
+    """
+
+    def __init__(
+        self,
+        signature: FileSignature,
+        last_updated: str,
+        items: Sequence[Dict[str, Any]],
+        store: Optional[InsightStore] = None,
+        encoded: Optional[EncodedInsights] = None,
+        appended: Optional[Tuple[FileSignature, Sequence[Dict[str, Any]]]] = None
+    ):
+        self.signature = signature
+        self.last_updated = last_updated
+        # (signature of the previous snapshot, items added since) when the
+        # loader knows this one only appended to it
+        self.appended = appended
+        # A prebuilt store (and its encoded items) may come from a binary snapshot
+        self.store = store if store is not None else InsightStore(items)
+        # Same rows as the store, in date order
+        self.items = self.store.items
+        self.loaded_at = datetime.now(timezone.utc)
+        self._encoded_full: Optional[EncodedInsights] = encoded
+        self._encoded = LRUCache(MAX_ENCODED_PROJECTIONS)
+        # Encoded responses keyed by request, valid for this snapshot only
+        self.responses = LRUCache(RESPONSE_CACHE_BYTES, weigh=lambda cached: cached.size)
+
+    def encoded(self, projection: Optional[Sequence[str]] = None) -> EncodedInsights:
+        """Pre-serialized items for a projection (None for full items), built once"""
+        if projection is None:
+            if self._encoded_full is None:
+                self._encoded_full = EncodedInsights(self.items, self.last_updated)
+            return self._encoded_full
+        key = tuple(projection)
+        return self._encoded.get_or_build(key, lambda: EncodedInsights(self.items, self.last_updated, key))
+
+    @property
+    def version(self) -> str:
+        """Stable identifier of the file contents, usable as a cache key"""
+        if self.signature is None:
+            return "empty"
+        inode, size, mtime_ns = self.signature
+        return f"{inode:x}-{size:x}-{mtime_ns:x}"
+
+    @property
+    def exists(self) -> bool:
+        return self.signature is not None
+
+def validate_items(items: Sequence[Any], normalize: Optional[Normalizer], source: str) -> List[Dict[str, Any]]:
+    """Keep the dict items that pass ``normalize``, logging how many were dropped"""
+    valid = [item for item in items if isinstance(item, dict)]
+    if normalize is not None:
+        valid = [item for item in map(normalize, valid) if item is not None]
+    if len(valid) < len(items):
+        logger.warning(f"Skipped {len(items) - len(valid)} invalid items in {source}")
+    return valid
+
+def load_snapshot(path: str, signature: FileSignature, normalize: Optional[Normalizer] = None) -> Snapshot:
+    """Parse the data file into a Snapshot, validating each item once"""
+    if signature is None:
+        return Snapshot(None, "never", [])
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict) or 'items' not in data:
+        logger.error(f"Invalid data structure in {path}")
+        return Snapshot(signature, "never", [])
+
+    items = data.get('items', [])
+    if not isinstance(items, list):
+        items = []
+
+    return Snapshot(signature, data.get('last_updated', 'unknown'), validate_items(items, normalize, path))
+
+class SnapshotLoader:
+    """Process-wide cache of the parsed data file.
+
+    The file is stat'ed on every access and only re-parsed when its inode,
+    size or mtime changed. The new Snapshot replaces the old one with a single
+    reference assignment, so readers never observe a half-built state.
+    Items are validated with ``normalize`` once per load, and the full
+    response encoding is prepared before the swap.
+
+    When a background watcher calls ``refresh`` instead, ``get`` stops
+    checking the file and just returns the current snapshot, so no request
+    ever pays for a rebuild.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        normalize: Optional[Normalizer] = None,
+        load: Callable[[str, FileSignature, Optional[Normalizer]], Snapshot] = load_snapshot,
+        signature: Callable[[str], FileSignature] = file_signature
+    ):
+        self.path = path
+        self.normalize = normalize
+        # Storage backend: how to identify the data's current version and load it
+        self.load = load
+        self.signature = signature
+        self.watching = False
+        self.last_rebuild_seconds: Optional[float] = None
+        self.last_rebuild_at: Optional[datetime] = None
+        # Called with the duration of every successful rebuild
+        self.on_rebuild: Optional[Callable[[float], None]] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._failed_signature: FileSignature = None
+        self._pending_signature: FileSignature = None
+        self._pending_since = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Snapshot:
+        """Return the current snapshot, reloading it if the file changed"""
+        snapshot = self._snapshot
+        if self.watching and snapshot is not None:
+            return snapshot
+        return self._load(self.signature(self.path))
+
+    def refresh(self, debounce: float = 0.0) -> bool:
+        """Reload if the file changed and then stayed unchanged for ``debounce`` seconds.
+
+        Meant to be polled by a background watcher. Returns True when a new
+        snapshot was swapped in.
+        """
+        signature = self.signature(self.path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            self._pending_signature = None
+            return False
+
+        # A writer still busy with the file keeps changing its size/mtime,
+        # which restarts the wait
+        now = time.monotonic()
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            self._pending_since = now
+        if now - self._pending_since < debounce:
+            return False
+        return self._load(signature) is not snapshot
+
+    def _load(self, signature: FileSignature) -> Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+        if signature is not None and signature == self._failed_signature:
+            return snapshot or Snapshot(None, "never", [])
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.signature == signature:
+                return snapshot
+
+            started = time.perf_counter()
+            try:
+                snapshot = self.load(self.path, signature, self.normalize)
+                snapshot.encoded()
+            except json.JSONDecodeError as e:
+                # Most likely a partially written file; keep serving the old
+                # data and don't re-parse this exact file on every request
+                logger.error(f"JSON decode error in {self.path}: {e}")
+                self._failed_signature = signature
+                return self._snapshot or Snapshot(None, "never", [])
+
+            self.last_rebuild_seconds = time.perf_counter() - started
+            self.last_rebuild_at = datetime.now(timezone.utc)
+            logger.info(
+                f"Loaded {len(snapshot.items)} items from {self.path} "
+                f"(version {snapshot.version}) in {self.last_rebuild_seconds:.2f}s"
+            )
+            if self.on_rebuild is not None:
+                self.on_rebuild(self.last_rebuild_seconds)
+            self._snapshot = snapshot
+            return snapshot
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        """The snapshot being served, without checking the file"""
+        return self._snapshot
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the currently cached snapshot, if any"""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
@@ -0,0 +1,258 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Common Indonesian and English words that say nothing about the review, plus
+# the generic banking terms the dashboard word cloud has always left out
+STOPWORDS = frozenset("""
+adalah agar akan aku anda apa atau bagaimana bagi bahwa bank banyak baru belum
+biar bisa boleh bri buat cuma dalam dan dari dengan dong gak ganti harus hanya
+ini itu jadi jangan juga kalau kalian kami karena kita kok kurang lagi lain
+lebih masih mau memang mereka mohon nya oleh pada para saat saja sama sampai
+sangat saya sebelum sedang sejak selalu semua seperti sering setelah sudah
+supaya tapi tersebut terus tetapi tidak tolong untuk yang
+about after again also been before being both could does doing down each from
+have having here into just more most much only other over same should some
+such than that their them then there these they this those through under until
+very were what when where which while will with would your
+customer fitur service
+""".split())
+
+# Keywords must be longer than this many characters
+MIN_KEYWORD_LENGTH = 4
+
+_NON_WORD = re.compile(r'[^a-z0-9\s]')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words with punctuation stripped (same rules as the web word cloud)"""
+    return _NON_WORD.sub('', text.lower()).split()
+
+def is_keyword(term: str) -> bool:
+    return len(term) >= MIN_KEYWORD_LENGTH and term not in STOPWORDS
+
+class TokenColumn:
+    """Token ids of one text field for every row, in CSR layout.
+
+    Row ``r`` holds ``ids[offsets[r]:offsets[r + 1]]``.
+    """
+
+    def __init__(self, offsets: np.ndarray, ids: np.ndarray):
+        self.offsets = offsets
+        self.ids = ids
+
+    def lengths(self, rows: np.ndarray) -> np.ndarray:
+        return self.offsets[rows + 1] - self.offsets[rows]
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """Concatenated token ids of the given rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = self.lengths(rows)
+        if not lengths.sum():
+            return np.zeros(0, dtype=self.ids.dtype)
+        # Index of every token: its row's offset plus its position in the row
+        starts = np.repeat(self.offsets[rows], lengths)
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.ids[starts + within]
+
+class KeywordIndex:
+    """Tokenized text columns plus per-day keyword counts.
+
+    Rows are expected in day order with ``day_starts`` marking where each day
+    bucket begins (the undated rows form the last bucket). Top keywords for a
+    day-aligned row range merge the precomputed per-day counts; any other row
+    selection counts the stored token ids directly, without re-tokenizing.
+    """
+
+    def __init__(self, texts: Dict[str, Sequence[str]], day_starts: np.ndarray, size: int):
+        self.term_ids: Dict[str, int] = {}
+        self.columns: Dict[str, TokenColumn] = {
+            field: self._encode(values) for field, values in texts.items()
+        }
+        self.terms: List[str] = list(self.term_ids)
+        self.keyword = np.fromiter((is_keyword(term) for term in self.terms), dtype=bool, count=len(self.terms))
+
+        # Bucket b covers rows [bounds[b], bounds[b + 1])
+        self.bounds = np.append(day_starts, size).astype(np.int64)
+        self.day_counts: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        for field, column in self.columns.items():
+            buckets = []
+            for b in range(len(self.bounds) - 1):
+                ids = column.ids[column.offsets[self.bounds[b]]:column.offsets[self.bounds[b + 1]]]
+                ids = ids[self.keyword[ids]]
+                buckets.append(np.unique(ids, return_counts=True))
+            self.day_counts[field] = buckets
+
+    def _encode(self, values: Sequence[str]) -> TokenColumn:
+        term_ids = self.term_ids
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        ids: List[int] = []
+        for row, text in enumerate(values):
+            for term in tokenize(text or ''):
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids)
+                ids.append(term_id)
+            offsets[row + 1] = len(ids)
+        return TokenColumn(offsets, np.array(ids, dtype=np.int32))
+
+    def _bucket_range(self, rows: slice) -> Optional[Tuple[int, int]]:
+        """Buckets exactly covering a row slice, None if it isn't day-aligned"""
+        lo = int(np.searchsorted(self.bounds, rows.start, side='left'))
+        hi = int(np.searchsorted(self.bounds, rows.stop, side='left'))
+        if rows.start == rows.stop:
+            return lo, lo
+        if lo >= len(self.bounds) or self.bounds[lo] != rows.start or hi >= len(self.bounds) or self.bounds[hi] != rows.stop:
+            return None
+        return lo, hi
+
+    def counts(self, rows, fields: Sequence[str]) -> np.ndarray:
+        """Keyword frequencies (indexed by term id) over a row slice or row array"""
+        counts = np.zeros(len(self.terms), dtype=np.int64)
+        buckets = self._bucket_range(rows) if isinstance(rows, slice) else None
+        for field in fields:
+            if buckets is not None:
+                per_day = self.day_counts[field][buckets[0]:buckets[1]]
+                if per_day:
+                    ids = np.concatenate([ids for ids, _ in per_day])
+                    weights = np.concatenate([day for _, day in per_day])
+                    counts += np.bincount(ids, weights=weights, minlength=len(self.terms)).astype(np.int64)
+                continue
+            if isinstance(rows, slice):
+                rows = np.arange(rows.start, rows.stop)
+            ids = self.columns[field].gather(rows)
+            ids = ids[self.keyword[ids]]
+            counts += np.bincount(ids, minlength=len(self.terms))
+        return counts
+
+    def top(self, rows, k: int, fields: Sequence[str] = ('title',)) -> List[Tuple[str, int]]:
+        """Top ``k`` keywords as ``(word, count)``, most frequent first.
+
+        Ties are broken by first appearance in the data.
+        """
+        counts = self.counts(rows, fields)
+        present = np.flatnonzero(counts)
+        if len(present) > k:
+            # Partial selection instead of sorting every term
+            threshold = np.partition(counts[present], len(present) - k)[len(present) - k]
+            present = present[counts[present] >= threshold]
+        order = np.lexsort((present, -counts[present]))[:k]
+        return [(self.terms[term], int(counts[term])) for term in present[order]]
+
+_PHRASE = re.compile(r'"([^"]*)"')
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a search query into required terms and quoted phrases.
+
+    Every term is required (AND); a phrase additionally requires its terms to
+    appear next to each other in the same field.
+    """
+    phrases = [tokenize(phrase) for phrase in _PHRASE.findall(query)]
+    phrases = [phrase for phrase in phrases if phrase]
+    terms = tokenize(_PHRASE.sub(' ', query))
+    for phrase in phrases:
+        terms.extend(phrase)
+    return list(dict.fromkeys(terms)), [phrase for phrase in phrases if len(phrase) > 1]
+
+class InvertedIndex:
+    """Term -> posting list of (row, term frequency) over all token columns.
+
+    Built from the KeywordIndex's tokenized rows, so the text is only
+    tokenized once per snapshot. Postings of a term are sorted by row, which
+    lets AND queries intersect them and BM25 look up frequencies by binary
+    search.
+    """
+
+    def __init__(self, keywords: KeywordIndex, size: int, k1: float = 1.2, b: float = 0.75):
+        self.keywords = keywords
+        self.size = size
+        self.k1 = k1
+        self.b = b
+        n_terms = len(keywords.terms)
+        all_rows = np.arange(size)
+
+        token_rows = []
+        token_terms = []
+        self.doc_len = np.zeros(size, dtype=np.int64)
+        for column in keywords.columns.values():
+            lengths = column.lengths(all_rows)
+            self.doc_len += lengths
+            token_rows.append(np.repeat(all_rows, lengths))
+            token_terms.append(column.ids.astype(np.int64))
+        self.avg_doc_len = float(self.doc_len.mean()) if size else 0.0
+
+        if size and token_rows:
+            pairs, tf = np.unique(np.concatenate(token_terms) * size + np.concatenate(token_rows), return_counts=True)
+            posting_terms = pairs // size
+            self.rows = (pairs % size).astype(np.int32)
+        else:
+            posting_terms = np.zeros(0, dtype=np.int64)
+            tf = np.zeros(0, dtype=np.int64)
+            self.rows = np.zeros(0, dtype=np.int32)
+        self.tf = tf.astype(np.int32)
+        # Postings of term t are rows[offsets[t]:offsets[t + 1]]
+        self.offsets = np.searchsorted(posting_terms, np.arange(n_terms + 1))
+
+    def postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.rows[lo:hi], self.tf[lo:hi]
+
+    def _phrase_mask(self, rows: np.ndarray, phrase: List[int]) -> np.ndarray:
+        """Which of ``rows`` have the phrase's terms next to each other in one field"""
+        found = np.zeros(len(rows), dtype=bool)
+        width = len(phrase)
+        for column in self.keywords.columns.values():
+            ids = column.gather(rows)
+            starts = len(ids) - width + 1
+            if starts <= 0:
+                continue
+            # Row of every token; a match must start and end in the same row
+            owner = np.repeat(np.arange(len(rows)), column.lengths(rows))
+            match = owner[:starts] == owner[width - 1:]
+            for position, term_id in enumerate(phrase):
+                match &= ids[position:position + starts] == term_id
+            found[owner[:starts][match]] = True
+        return found
+
+    def search(self, query: str, keep=None) -> Tuple[np.ndarray, np.ndarray]:
+        """All rows matching ``query`` with their BM25 scores, best first.
+
+        ``keep`` optionally maps an array of candidate rows to a boolean mask,
+        so structured filters are applied before phrase checks and scoring.
+        """
+        terms, phrases = parse_query(query)
+        term_ids = [self.keywords.term_ids.get(term) for term in terms]
+        if not terms or any(term_id is None for term_id in term_ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        # Intersect from the rarest term up so the candidate set shrinks fast
+        term_ids.sort(key=lambda t: self.offsets[t + 1] - self.offsets[t])
+        candidates = self.postings(term_ids[0])[0]
+        for term_id in term_ids[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, self.postings(term_id)[0], assume_unique=True)
+        candidates = candidates.astype(np.int64)
+
+        if keep is not None and len(candidates):
+            candidates = candidates[keep(candidates)]
+        if phrases and len(candidates):
+            for phrase in phrases:
+                if not len(candidates):
+                    break
+                candidates = candidates[self._phrase_mask(candidates, [self.keywords.term_ids[term] for term in phrase])]
+        if not len(candidates):
+            return candidates, np.zeros(0)
+
+        # BM25 over the surviving candidates
+        scores = np.zeros(len(candidates))
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[candidates] / (self.avg_doc_len or 1))
+        for term_id in term_ids:
+            rows, tf = self.postings(term_id)
+            df = len(rows)
+            idf = np.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            freq = tf[np.searchsorted(rows, candidates)].astype(np.float64)
+            scores += idf * freq * (self.k1 + 1) / (freq + norm)
+
+        order = np.lexsort((candidates, -scores))
+        return candidates[order], scores[order]
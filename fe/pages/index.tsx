@@ -131,10 +131,25 @@ interface InsightsData {
   items: Insight[]
 }
 
+// Widgets computed by the API for the current filters (/api/dashboard)
+interface DashboardData {
+  last_updated: string
+  total: number
+  social_media: Record<string, number>
+  products: Record<string, number>
+  channels: Record<string, number>
+  sentiment: { positive: number; neutral: number; negative: number }
+  sentiment_score: number
+  positive_percentage: number
+  keywords: Array<{ word: string; count: number }>
+  latest: Insight[]
+}
+
 export default function Home() {
   const [mounted, setMounted] = useState(false)
   const [healthStatus, setHealthStatus] = useState<HealthStatus | null>(null)
   const [insights, setInsights] = useState<InsightsData | null>(null)
+  const [dashboard, setDashboard] = useState<DashboardData | null>(null)
   const [isOffline, setIsOffline] = useState(false)
   const [loading, setLoading] = useState(true)
   
@@ -187,15 +202,22 @@ export default function Home() {
       'Apple AppStore': 0,
       'Google Playstore': 0
     }
+    if (dashboard) {
+      Object.keys(counts).forEach(platform => {
+        counts[platform] = dashboard.social_media[platform] || 0
+      })
+      return counts
+    }
     filteredInsights.forEach(item => {
       if (item.social_media && counts.hasOwnProperty(item.social_media)) {
         counts[item.social_media]++
       }
     })
     return counts
-  }, [filteredInsights])
+  }, [dashboard, filteredInsights])
 
   const productCounts = useMemo(() => {
+    if (dashboard) return dashboard.products
     const counts: Record<string, number> = {}
     filteredInsights.forEach(item => {
       if (item.product) {
@@ -203,9 +225,10 @@ export default function Home() {
       }
     })
     return counts
-  }, [filteredInsights])
+  }, [dashboard, filteredInsights])
 
   const channelCounts = useMemo(() => {
+    if (dashboard) return dashboard.channels
     const counts: Record<string, number> = {}
     filteredInsights.forEach(item => {
       if (item.channel) {
@@ -213,9 +236,10 @@ export default function Home() {
       }
     })
     return counts
-  }, [filteredInsights])
+  }, [dashboard, filteredInsights])
 
   const sentimentCounts = useMemo(() => {
+    if (dashboard) return dashboard.sentiment
     const counts = { positive: 0, neutral: 0, negative: 0 }
     filteredInsights.forEach(item => {
       const sentiment = item.sentiment?.toLowerCase()
@@ -224,7 +248,7 @@ export default function Home() {
       else counts.neutral++
     })
     return counts
-  }, [filteredInsights])
+  }, [dashboard, filteredInsights])
 
   // Customer Knowledge Analytics Data
   const socialMediaData = useMemo(() => ({
@@ -296,6 +320,10 @@ export default function Home() {
 
   // Extract keywords from filtered insights for wordcloud
   const keywordsData = useMemo(() => {
+    if (dashboard) {
+      return dashboard.keywords.map(({ word, count }) => ({ text: word, value: count }))
+    }
+    
     console.log('Calculating keywordsData from filteredInsights:', filteredInsights?.length || 0)
     
     if (!filteredInsights || filteredInsights.length === 0) {
@@ -333,10 +361,11 @@ export default function Home() {
     }
     
     return result
-  }, [filteredInsights])
+  }, [dashboard, filteredInsights])
 
   // Calculate metrics from filtered data
-  const totalFeedback = filteredInsights.length
+  const totalFeedback = dashboard ? dashboard.total : filteredInsights.length
+  const latestInsights = dashboard ? dashboard.latest : filteredInsights.slice(0, 6)
   const totalSentiment = sentimentCounts.positive + sentimentCounts.neutral + sentimentCounts.negative
   const sentimentScore = totalSentiment > 0 
     ? ((sentimentCounts.positive * 5 + sentimentCounts.neutral * 3 + sentimentCounts.negative * 1) / totalSentiment).toFixed(1)
@@ -358,9 +387,11 @@ export default function Home() {
     },
   }
 
-  const fetchWithTimeout = async (url: string, timeout = 3000) => {
+  const fetchWithTimeout = async (url: string, timeout = 3000, signal?: AbortSignal) => {
     const controller = new AbortController()
     const timeoutId = setTimeout(() => controller.abort(), timeout)
+    const abort = () => controller.abort()
+    signal?.addEventListener('abort', abort)
     
     try {
       const response = await fetch(url, { signal: controller.signal })
@@ -369,6 +400,8 @@ export default function Home() {
     } catch (error) {
       clearTimeout(timeoutId)
       throw error
+    } finally {
+      signal?.removeEventListener('abort', abort)
     }
   }
 
@@ -384,16 +417,31 @@ export default function Home() {
     }
   }
 
-  const fetchInsights = async () => {
+  // Charts are computed by the API for the current filters; only the offline
+  // fallback downloads the items and aggregates them in the browser
+  // ``signal`` is aborted once the filters change again; a response for the
+  // old filters must not replace the one for the new filters
+  const fetchDashboard = async (signal: AbortSignal) => {
+    const params = new URLSearchParams()
+    if (startDate) params.set('start_date', startDate)
+    if (endDate) params.set('end_date', endDate)
+    if (selectedProduct !== 'all') params.set('product', selectedProduct)
+    if (selectedChannel !== 'all') params.set('channel', selectedChannel)
+    if (selectedSocialMedia !== 'all') params.set('social_media', selectedSocialMedia)
+    if (selectedSentiment !== 'all') params.set('sentiment', selectedSentiment)
+    
     try {
-      const response = await fetchWithTimeout(`${process.env.NEXT_PUBLIC_API_BASE}/insights`)
-      if (response.ok) {
-        const data = await response.json()
-        setInsights(data)
-        setIsOffline(false)
-      }
+      const response = await fetchWithTimeout(`${process.env.NEXT_PUBLIC_API_BASE}/api/dashboard?${params.toString()}`, 3000, signal)
+      if (!response.ok) throw new Error(`Dashboard request failed with ${response.status}`)
+      const data = await response.json()
+      if (signal.aborted) return
+      setDashboard(data)
+      setIsOffline(false)
     } catch (error) {
-      console.error('Failed to fetch insights, trying fallback:', error)
+      if (signal.aborted) return
+      console.error('Failed to fetch dashboard, trying fallback:', error)
+      setDashboard(null)
+      if (insights) return
       try {
         const fallbackResponse = await fetch('/fallback.json')
         if (fallbackResponse.ok) {
@@ -408,13 +456,18 @@ export default function Home() {
   }
 
   useEffect(() => {
+    fetchHealthStatus()
+  }, [])
+
+  useEffect(() => {
+    const controller = new AbortController()
     const loadData = async () => {
-      setLoading(true)
-      await Promise.all([fetchHealthStatus(), fetchInsights()])
-      setLoading(false)
+      await fetchDashboard(controller.signal)
+      if (!controller.signal.aborted) setLoading(false)
     }
     loadData()
-  }, [])
+    return () => controller.abort()
+  }, [startDate, endDate, selectedProduct, selectedChannel, selectedSocialMedia, selectedSentiment])
 
   const formatTime = (timeString: string) => {
     try {
@@ -736,11 +789,11 @@ export default function Home() {
           </div>
 
           {/* Insights Section */}
-          {filteredInsights.length > 0 && (
+          {latestInsights.length > 0 && (
             <div className="insights-section">
-              <h2>Latest Customer Insights ({filteredInsights.length} items)</h2>
+              <h2>Latest Customer Insights ({totalFeedback} items)</h2>
               <div className="insights-grid">
-                {filteredInsights.slice(0, 6).map((insight, index) => (
+                {latestInsights.map((insight, index) => (
                   <div key={index} className="insight-card">
                     <div className="insight-header">
                       <span className="insight-type">{insight.type}</span>
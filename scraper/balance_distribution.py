@@ -4,13 +4,28 @@ Balance the distribution by adding more dummy data for non-Playstore platforms
 
 import json
 import random
+import sys
 from datetime import datetime, timedelta
 
+# The storage formats live with the API
+sys.path.append('../api')
+import insights_db
+from insights_db import DB_PATH
+from segments import SEGMENTS_DIR, append_items, read_items
+
 # Read existing data
 data_path = '../data/insights.json'
 
-with open(data_path, 'r') as f:
-    data = json.load(f)
+if SEGMENTS_DIR:
+    # Segment storage: existing items are only read, new ones get appended
+    data = {'items': read_items(SEGMENTS_DIR), 'sources': {}}
+elif DB_PATH:
+    # SQLite storage: likewise, new items are added as rows
+    conn = insights_db.connect(DB_PATH)
+    data = {'items': insights_db.read_items(conn)[1], 'sources': {}}
+else:
+    with open(data_path, 'r') as f:
+        data = json.load(f)
 
 existing_insights = data['items']
 
@@ -218,10 +233,18 @@ data['summary'] = {
 }
 
 # Save updated data
-with open(data_path, 'w') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
-
-print(f"\n✅ Successfully updated insights.json")
+if SEGMENTS_DIR:
+    append_items(SEGMENTS_DIR, dummy_insights, data['last_updated'])
+    print(f"\n✅ Successfully appended a segment to {SEGMENTS_DIR}")
+elif DB_PATH:
+    insights_db.write_items(conn, dummy_insights, data['last_updated'])
+    conn.close()
+    print(f"\n✅ Successfully added {len(dummy_insights)} rows to {DB_PATH}")
+else:
+    with open(data_path, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    print(f"\n✅ Successfully updated insights.json")
 print(f"📊 Total insights: {len(existing_insights)}")
 
 print(f"\n🌐 NEW Social Media Distribution:")
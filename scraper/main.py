@@ -1,10 +1,16 @@
 import os
+import sys
 import json
 import logging
 import random
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
 
+# The storage formats live with the API; the image copies them next to this file
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from insights_db import DB_PATH, connect, write_items
+from segments import SEGMENTS_DIR, append_items
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -274,14 +280,28 @@ def main():
             "items": insights_items
         }
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(DATA_PATH) if os.path.dirname(DATA_PATH) else '.', exist_ok=True)
-        
-        # Save to file
-        with open(DATA_PATH, "w", encoding='utf-8') as f:
-            json.dump(insights_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Successfully saved {len(insights_items)} items to {DATA_PATH}")
+        if SEGMENTS_DIR:
+            # A generated run is a complete dataset, so it replaces the
+            # previous segments instead of adding to them
+            append_items(SEGMENTS_DIR, insights_items, insights_data["last_updated"], replace=True)
+            logger.info(f"Successfully saved {len(insights_items)} items as a new segment in {SEGMENTS_DIR}")
+        elif DB_PATH:
+            # Same for the database: one transaction replaces every row
+            conn = connect(DB_PATH)
+            try:
+                write_items(conn, insights_items, insights_data["last_updated"], replace=True)
+            finally:
+                conn.close()
+            logger.info(f"Successfully saved {len(insights_items)} items to {DB_PATH}")
+        else:
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(DATA_PATH) if os.path.dirname(DATA_PATH) else '.', exist_ok=True)
+            
+            # Save to file
+            with open(DATA_PATH, "w", encoding='utf-8') as f:
+                json.dump(insights_data, f, indent=2, ensure_ascii=False)
+            
+            logger.info(f"Successfully saved {len(insights_items)} items to {DATA_PATH}")
         logger.info("Scraper completed successfully")
         
     except Exception as e:
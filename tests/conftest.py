@@ -0,0 +1,39 @@
+import os
+import sys
+import json
+import tempfile
+
+import pytest
+
+# The API modules import each other as top-level modules, the way uvicorn
+# runs them from api/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+# app reads its paths at import; keep them out of /data
+DATA_DIR = tempfile.mkdtemp(prefix='berinsight-tests-')
+os.environ.setdefault('DATA_PATH', os.path.join(DATA_DIR, 'insights.json'))
+os.environ.setdefault('BINARY_SNAPSHOT_PATH', '')
+os.environ.setdefault('DISPOSISI_DB_PATH', os.path.join(DATA_DIR, 'disposisi.db'))
+os.environ.setdefault('WATCH_INTERVAL', '0')
+os.environ.setdefault('LOOP_LAG_INTERVAL', '0')
+
+def write_insights(items, last_updated='2026-10-16T08:00:00'):
+    """Replace the served data file; a new inode makes the next request reload it"""
+    path = os.environ['DATA_PATH']
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump({'last_updated': last_updated, 'items': items}, f)
+    os.replace(f"{path}.tmp", path)
+
+def make_items(count, day='2026-10-01', **fields):
+    return [
+        dict({'title': f'Insight {n}', 'source': 'Playstore', 'summary': f'Ringkasan ulasan nomor {n}',
+              'type': 'complaint', 'product': 'BRImo', 'date': day}, **fields)
+        for n in range(count)
+    ]
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import app
+    with TestClient(app.app) as client:
+        yield client
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+
+from anomaly import SpikeDetector
+from store import Snapshot
+
+START = date(2026, 8, 1)
+
+def complaints(day: int, count: int, product: str = 'BRImo', feature: str = 'Transfer'):
+    return [
+        {'title': 't', 'source': 's', 'summary': 'x', 'type': 'complaint', 'product': product,
+         'feature': feature, 'category': None, 'date': (START + timedelta(days=day)).isoformat()}
+        for _ in range(count)
+    ]
+
+def history(days):
+    items = []
+    for day in days:
+        items += complaints(day, 1 + day % 3)
+        items += complaints(day, 2, product='Card')
+    return items
+
+def assert_same_state(incremental: SpikeDetector, full: SpikeDetector):
+    assert set(incremental.series) == set(full.series)
+    for key, series in full.series.items():
+        other = incremental.series[key]
+        assert other.first_day == series.first_day
+        assert other.counts == series.counts
+        assert other.mean == series.mean
+        assert other.var == series.var
+    assert incremental.spikes() == full.spikes()
+
+def test_chronological_append_matches_full_rebuild():
+    base = history(range(30))
+    first = Snapshot((1, 1, 1), 'a', base)
+    detector = SpikeDetector()
+    detector.sync(first)
+
+    # Newer days with gaps, a spike, and a series that didn't exist before
+    added = complaints(33, 2) + complaints(36, 15) + complaints(40, 1, feature='QRIS')
+    second = Snapshot((1, 2, 2), 'b', base + added, appended=((1, 1, 1), added))
+    detector.sync(second)
+
+    full = SpikeDetector()
+    full.sync(Snapshot((1, 2, 2), 'b', base + added))
+    assert_same_state(detector, full)
+    assert detector.signature == (1, 2, 2)
+    assert [(spike.key[0], spike.day - START.toordinal()) for spike in detector.spikes()] == [('BRImo', 36)]
+
+def test_late_items_for_past_days_match_full_rebuild():
+    base = history(range(20))
+    detector = SpikeDetector()
+    detector.sync(Snapshot((1, 1, 1), 'a', base))
+
+    added = complaints(5, 4) + complaints(-3, 1)
+    detector.sync(Snapshot((1, 2, 2), 'b', base + added, appended=((1, 1, 1), added)))
+
+    full = SpikeDetector()
+    full.sync(Snapshot((1, 2, 2), 'b', base + added))
+    assert_same_state(detector, full)
+
+def test_append_to_unknown_base_rebuilds():
+    base = history(range(10))
+    detector = SpikeDetector()
+    detector.sync(Snapshot((1, 1, 1), 'a', base))
+
+    added = complaints(12, 3)
+    # Appended to a snapshot this detector never saw
+    detector.sync(Snapshot((1, 3, 3), 'c', base + added, appended=((1, 2, 2), added)))
+
+    full = SpikeDetector()
+    full.sync(Snapshot((1, 3, 3), 'c', base + added))
+    assert_same_state(detector, full)
+
+def test_older_snapshot_keeps_its_own_spikes():
+    base = history(range(30))
+    old = Snapshot((1, 1, 1), 'a', base)
+    added = complaints(36, 15)
+    new = Snapshot((1, 2, 2), 'b', base + added, appended=((1, 1, 1), added))
+    detector = SpikeDetector()
+    old_view = detector.sync(old)
+    new_view = detector.sync(new)
+
+    # A request that grabbed the old snapshot before the reload
+    assert detector.sync(old).spikes() == old_view.spikes() == []
+    assert detector.signature == (1, 2, 2)
+    assert [spike.day - START.toordinal() for spike in new_view.spikes()] == [36]
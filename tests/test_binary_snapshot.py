@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from fastapi.responses import StreamingResponse
+from starlette.requests import Request
+
+from app import (
+    build_complaints, build_dashboard, build_insights, build_keywords, build_search,
+    build_sentiment_summary, build_trends, normalize_insight
+)
+from binary_snapshot import read_binary_snapshot, write_binary_snapshot
+from http_cache import cached_response, iter_chunks
+from store import file_signature, load_snapshot, parse_day
+
+FILTERS = dict(product=None, channel=None, social_media=None, sentiment=None)
+
+ITEMS = [
+    {'title': f'Transfer gagal {n}', 'source': 'Playstore', 'summary': f'saldo terpotong tapi transfer gagal {n % 4}',
+     'type': ('complaint', 'suggestion', 'insight')[n % 3], 'product': ('BRImo', 'Card', None)[n % 3],
+     'feature': ('Transfer', 'Login')[n % 2], 'channel': 'BRImo', 'sentiment': ('negative', 'neutral', 'positive')[n % 3],
+     'urgency_score': n % 100, 'date': f'2026-10-{1 + n % 20:02d}' if n % 11 else None, 'rating': n % 5 + 1}
+    for n in range(200)
+] + [{'title': 'no source'}]
+
+@pytest.fixture
+def snapshots(tmp_path):
+    path = str(tmp_path / 'insights.json')
+    with open(path, 'w') as f:
+        json.dump({'last_updated': '2026-10-16T08:00:00', 'items': ITEMS}, f)
+    signature = file_signature(path)
+    parsed = load_snapshot(path, signature, normalize_insight)
+    write_binary_snapshot(str(tmp_path / 'insights.json.bin'), parsed, signature)
+    mapped = read_binary_snapshot(str(tmp_path / 'insights.json.bin'), signature)
+    assert mapped is not None
+    return parsed, mapped
+
+def dump(model):
+    return model.model_dump() if hasattr(model, 'model_dump') else model.dict()
+
+def test_mapped_snapshot_answers_like_the_parsed_one(snapshots):
+    parsed, mapped = snapshots
+    assert mapped.last_updated == parsed.last_updated
+    assert list(mapped.items) == list(parsed.items)
+
+    start, end = parse_day('2026-10-03'), parse_day('2026-10-12')
+    for build in (
+        lambda s: build_complaints(s, None, None, None, None, ['feature']),
+        lambda s: build_complaints(s, start, end, None, None, []),
+        lambda s: build_sentiment_summary(s, start, None, None, None),
+        lambda s: build_trends(s, None, None, None, None, None, 'week', rolling=2),
+        lambda s: build_keywords(s, None, end, None, None, FILTERS, ['title', 'summary'], 10),
+        lambda s: build_dashboard(s, start, end, None, None, dict(FILTERS, product='BRImo'), 5, 5),
+    ):
+        assert dump(build(mapped)) == dump(build(parsed))
+    for build in (
+        lambda s: build_insights(s, start, end, dict(FILTERS, sentiment='negative'), 7, None, ['title', 'date']),
+        lambda s: build_search(s, '"transfer gagal" saldo', None, None, FILTERS, 10, None, None),
+    ):
+        assert bytes(build(mapped)) == bytes(build(parsed))
+
+def test_full_response_is_served_from_the_mapping(snapshots):
+    parsed, mapped = snapshots
+    pinned = build_insights(mapped, None, None, FILTERS, None, None, None)
+    body = pinned.body
+    assert isinstance(body, memoryview)
+    assert bytes(body) == build_insights(parsed, None, None, FILTERS, None, None, None).body
+
+    request = Request({'type': 'http', 'method': 'GET', 'path': '/insights', 'query_string': b'', 'headers': []})
+    response = cached_response(request, mapped, lambda: pinned)
+    assert isinstance(response, StreamingResponse)
+    assert response.headers['content-length'] == str(len(body))
+    assert b''.join(iter_chunks(body)) == bytes(body)
+    # Nothing of the mapped body counts against the response cache
+    assert mapped.responses.weight == 0
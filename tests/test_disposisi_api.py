@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+import app
+
+def assignment(n: int, **fields):
+    return dict({
+        'insight_id': f'INS-{n}', 'assigned_to': 'Budi', 'division': 'Digital Banking',
+        'priority': 'high', 'due_date': '2026-11-01', 'notes': None
+    }, **fields)
+
+def test_concurrent_posts_get_distinct_stored_ids(client):
+    async def post_all():
+        async with httpx.AsyncClient(app=app.app, base_url='http://test') as http:
+            return await asyncio.gather(*(http.post('/api/disposisi', json=assignment(n)) for n in range(100)))
+
+    responses = asyncio.run(post_all())
+    assert all(response.status_code == 200 for response in responses)
+    ids = [response.json()['id'] for response in responses]
+    assert len(set(ids)) == 100
+
+    # Each one was committed before its response was sent
+    for n, disposisi_id in enumerate(ids):
+        stored = client.get(f'/api/disposisi/{disposisi_id}').json()
+        assert (stored['insight_id'], stored['status']) == (f'INS-{n}', 'open')
+
+def test_invalid_disposisi_is_rejected(client):
+    assert client.post('/api/disposisi', json=assignment(1, priority='urgent')).status_code == 400
+    assert client.post('/api/disposisi', json=assignment(1, division=' ')).status_code == 400
+    assert client.get('/api/disposisi/DISP-missing').status_code == 404
+    assert client.get('/api/disposisi', params={'cursor': 'DISP-missing'}).status_code == 400
+
+def test_bulk_reports_every_item_in_request_order(client):
+    body = [assignment(0), assignment(1, priority='urgent'), 'not an object', assignment(3), assignment(4, due_date='soon')]
+    response = client.post('/api/disposisi/bulk', json=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result['created'], result['failed']) == (2, 3)
+    assert [(r['index'], r['status']) for r in result['results']] == [
+        (0, 'created'), (1, 'error'), (2, 'error'), (3, 'created'), (4, 'error')
+    ]
+    assert 'priority' in result['results'][1]['error']
+    assert 'due_date' in result['results'][4]['error']
+
+    created = [r['id'] for r in result['results'] if r['status'] == 'created']
+    assert [client.get(f'/api/disposisi/{i}').json()['insight_id'] for i in created] == ['INS-0', 'INS-3']
+    # Newest first, so the bulk comes back reversed
+    listed = client.get('/api/disposisi', params={'limit': 2}).json()['items']
+    assert [item['id'] for item in listed] == created[::-1]
+
+def test_bulk_accepts_ndjson(client):
+    lines = '\n'.join(['{"insight_id": "INS-9", "assigned_to": "Sari", "division": "Ops", "priority": "low", "due_date": "2026-11-02"}', '{broken', ''])
+    response = client.post('/api/disposisi/bulk', content=lines, headers={'Content-Type': 'application/x-ndjson'})
+    result = response.json()
+    assert (result['created'], result['failed']) == (1, 1)
+    assert [r['status'] for r in result['results']] == ['created', 'error']
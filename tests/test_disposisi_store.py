@@ -0,0 +1,37 @@
+import pytest
+
+from disposisi_store import DisposisiStore
+
+def record(n: int, division: str = 'IT'):
+    return {'insight_id': f'INS-{n}', 'assigned_to': 'Budi', 'division': division, 'priority': 'high', 'due_date': '2026-11-01'}
+
+def test_records_added_together_list_newest_first(tmp_path):
+    store = DisposisiStore(str(tmp_path / 'disposisi.db'))
+    try:
+        first = store.add([record(n) for n in range(50)]).result()
+        second = store.add([record(n) for n in range(50, 60)]).result()
+        stored = [r['id'] for r in first + second]
+
+        listed, cursor = [], None
+        while True:
+            page, cursor = store.list({}, limit=7, after=cursor)
+            listed += [r['id'] for r in page]
+            if cursor is None:
+                break
+        assert listed == stored[::-1]
+
+        page, _ = store.list({'division': 'IT'}, limit=3, after=stored[10])
+        assert [r['id'] for r in page] == stored[9:6:-1]
+    finally:
+        store.close()
+
+def test_readers_cannot_write_and_unknown_cursors_are_rejected(tmp_path):
+    store = DisposisiStore(str(tmp_path / 'disposisi.db'))
+    try:
+        assert store.list({}) == ([], None)
+        with pytest.raises(Exception, match='readonly'):
+            store._reader().execute("DELETE FROM disposisi")
+        with pytest.raises(ValueError):
+            store.list({}, after='DISP-unknown')
+    finally:
+        store.close()
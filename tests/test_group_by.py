@@ -0,0 +1,41 @@
+from conftest import make_items, write_insights
+
+def items():
+    data = []
+    # Transfer: 5 complaints, Login: 3, no feature: 1; suggestions are separate
+    for n, (feature, channel, urgency) in enumerate(
+        [('Transfer', 'BRImo', 90)] * 5 + [('Login', 'BRILink', 40)] * 3 + [(None, 'BRImo', 60)]
+    ):
+        data += make_items(1, day=f'2026-10-{1 + n:02d}', title=f'C{n}', feature=feature, channel=channel, urgency_score=urgency)
+    data += make_items(2, day='2026-10-02', type='suggestion', feature='QRIS', urgency_score=75)
+    return data
+
+def test_complaints_grouped_by_extra_fields(client):
+    write_insights(items())
+    body = client.get('/api/complaints', params={'group_by': 'feature,channel'}).json()
+    assert body['total_complaints'] == 9
+
+    features = [(g['value'], g['count'], g['percentage'], g['examples'], g['priority']) for g in body['groups']['feature']]
+    assert features == [
+        ('Transfer', 5, 55.56, ['C0', 'C1', 'C2'], 'critical'),
+        ('Login', 3, 33.33, ['C5', 'C6', 'C7'], 'low'),
+        ('General', 1, 11.11, ['C8'], 'medium'),
+    ]
+    assert [(g['value'], g['count']) for g in body['groups']['channel']] == [('BRImo', 6), ('BRILink', 3)]
+    # The fixed groupings are still there
+    assert [(g['product'], g['count']) for g in body['by_product']] == [('BRImo', 9)]
+
+def test_group_by_respects_the_date_range_and_type(client):
+    write_insights(items())
+    body = client.get('/api/complaints', params={'group_by': 'feature', 'start_date': '2026-10-05', 'end_date': '2026-10-07'}).json()
+    assert [(g['value'], g['count'], g['examples']) for g in body['groups']['feature']] == [
+        ('Login', 2, ['C5', 'C6']), ('Transfer', 1, ['C4'])
+    ]
+
+    suggestions = client.get('/api/suggestions', params={'group_by': 'feature'}).json()
+    assert [(g['value'], g['count'], g['priority']) for g in suggestions['groups']['feature']] == [('QRIS', 2, 'high')]
+
+def test_unknown_group_by_field_is_rejected(client):
+    response = client.get('/api/complaints', params={'group_by': 'feature,title'})
+    assert response.status_code == 400
+    assert 'title' in response.json()['detail']
@@ -0,0 +1,66 @@
+import app
+from conftest import make_items, write_insights
+from http_cache import CachedBody
+from store import LRUCache
+
+def test_not_modified_until_the_data_changes(client):
+    write_insights(make_items(3))
+    first = client.get('/api/complaints')
+    assert first.status_code == 200
+    etag = first.headers['etag']
+
+    again = client.get('/api/complaints', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.headers['etag'] == etag
+    assert client.get('/api/complaints', headers={'If-None-Match': f'W/{etag}'}).status_code == 304
+    # Another query is another response
+    assert client.get('/api/complaints?product=BRImo', headers={'If-None-Match': etag}).status_code == 200
+
+    write_insights(make_items(4))
+    changed = client.get('/api/complaints', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
+
+def test_each_encoding_has_its_own_etag(client):
+    write_insights(make_items(50))
+    identity = client.get('/insights', headers={'Accept-Encoding': 'identity'})
+    gzipped = client.get('/insights', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in identity.headers
+    assert gzipped.headers['content-encoding'] == 'gzip'
+    assert gzipped.json() == identity.json()
+    assert gzipped.headers['etag'] == identity.headers['etag'][:-1] + '-gzip"'
+
+    # Whichever variant the client holds, the content is current
+    revalidated = client.get('/insights', headers={'Accept-Encoding': 'identity', 'If-None-Match': gzipped.headers['etag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == gzipped.headers['etag']
+
+def test_response_cache_is_bounded_by_bytes():
+    cache = LRUCache(3000, weigh=lambda cached: cached.size)
+    for n in range(4):
+        cache.get_or_build(n, lambda: CachedBody(b'x' * 1000))
+    assert len(cache) == 3 and cache.weight == 3000
+    assert cache.get(0) is None
+
+    # Compressing a variant adds to the entry's weight
+    cache.get(3).variant('gzip')
+    cache.reweigh(3)
+    assert cache.get(1) is None
+    assert cache.weight == sum(cache.get(n).size for n in (2, 3)) <= 3000
+
+    cache.get_or_build('big', lambda: CachedBody(b'x' * 5000))
+    assert cache.get('big') is None
+
+def test_full_response_is_pinned_outside_the_cache(client):
+    write_insights(make_items(50))
+    app.snapshot_loader.get().responses.max_size = 100
+    first = client.get('/insights', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['content-encoding'] == 'gzip'
+
+    snapshot = app.snapshot_loader.get()
+    pinned = snapshot.encoded(None).cached_body
+    assert pinned.variant('gzip') is pinned.variant('gzip')
+    assert snapshot.responses.weight == 0
+    again = client.get('/insights', headers={'Accept-Encoding': 'gzip'})
+    assert again.content == first.content
+    assert snapshot.encoded(None).cached_body is pinned
@@ -0,0 +1,43 @@
+from conftest import make_items, write_insights
+
+def items():
+    # Spread over days, one undated, with a product filter to page through
+    data = []
+    for day in range(1, 8):
+        data += make_items(4, day=f'2026-10-{day:02d}', product=('BRImo', 'Card')[day % 2])
+    data += make_items(2, day=None)
+    for n, item in enumerate(data):
+        item['title'] = f'Insight {n}'
+    return data
+
+def pages(client, **params):
+    titles, cursor, total = [], None, None
+    while True:
+        response = client.get('/insights', params=dict(params, **({'cursor': cursor} if cursor else {})))
+        assert response.status_code == 200, response.text
+        body = response.json()
+        total = body['total']
+        titles += [item['title'] for item in body['items']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            return titles, total
+
+def test_pages_cover_the_unpaged_response(client):
+    write_insights(items())
+    everything = [item['title'] for item in client.get('/insights').json()['items']]
+    assert len(everything) == 30
+    assert pages(client, limit=7) == (everything, 30)
+
+    filtered = [item['title'] for item in client.get('/insights', params={'product': 'Card'}).json()['items']]
+    assert pages(client, limit=5, product='Card') == (filtered, 16)
+    assert pages(client, limit=5, start_date='2026-10-03', end_date='2026-10-04')[1] == 8
+
+def test_cursor_expires_when_the_data_is_reloaded(client):
+    write_insights(items())
+    first = client.get('/insights', params={'limit': 10}).json()
+    assert len(first['items']) == 10
+
+    write_insights(items() + make_items(1, day='2026-10-09'))
+    response = client.get('/insights', params={'limit': 10, 'cursor': first['next_cursor']})
+    assert response.status_code == 410
+    assert client.get('/insights', params={'limit': 10, 'cursor': 'not-a-cursor'}).status_code == 400
@@ -0,0 +1,66 @@
+import json
+
+from insights_db import INDEXED_COLUMNS, connect, write_items
+from migrate_to_sqlite import migrate
+from sqlite_store import SqliteLoader, db_signature
+
+ITEMS = [
+    {'title': 'b', 'source': 's', 'summary': 'x', 'type': 'complaint', 'date': '2026-10-02', 'score': 3},
+    {'title': 'a', 'source': 's', 'summary': 'x', 'type': 'suggestion', 'date': '2026-10-01'},
+    {'title': 'c', 'source': 's', 'summary': 'x', 'type': 'complaint', 'date': None},
+]
+
+def write(path, items, last_updated, replace=False):
+    conn = connect(path)
+    try:
+        write_items(conn, items, last_updated, replace=replace)
+    finally:
+        conn.close()
+
+def test_items_come_back_in_date_order_with_extra_fields(tmp_path):
+    path = str(tmp_path / 'insights.db')
+    write(path, ITEMS, '2026-10-03')
+
+    snapshot = SqliteLoader()(path, db_signature(path))
+    assert snapshot.last_updated == '2026-10-03'
+    assert [item['title'] for item in snapshot.items] == ['a', 'b', 'c']
+    assert snapshot.items[1]['score'] == 3
+
+def test_filter_columns_are_indexed(tmp_path):
+    path = str(tmp_path / 'insights.db')
+    conn = connect(path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+    assert indexes == {f'idx_insights_{column}' for column in INDEXED_COLUMNS}
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM insights WHERE product = 'BRImo'").fetchall()
+    assert 'idx_insights_product' in plan[0][-1]
+
+def test_reload_reads_only_new_rows_until_replaced(tmp_path):
+    path = str(tmp_path / 'insights.db')
+    loader = SqliteLoader()
+    write(path, ITEMS, '2026-10-03')
+    first = loader(path, db_signature(path))
+    assert first.appended is None
+
+    added = [{'title': 'd', 'source': 's', 'summary': 'x', 'date': '2026-10-01'}]
+    write(path, added, '2026-10-04')
+    second = loader(path, db_signature(path))
+    assert second.appended == (first.signature, [dict(second.items[1])])
+    assert [item['title'] for item in second.items] == ['a', 'd', 'b', 'c']
+    assert second.last_updated == '2026-10-04'
+
+    write(path, added, '2026-10-05', replace=True)
+    third = loader(path, db_signature(path))
+    assert third.appended is None
+    assert [item['title'] for item in third.items] == ['d']
+
+def test_migration_keeps_valid_items(tmp_path):
+    json_path = str(tmp_path / 'insights.json')
+    db_path = str(tmp_path / 'insights.db')
+    with open(json_path, 'w') as f:
+        json.dump({'last_updated': '2026-10-03', 'items': ITEMS + [{'title': 'no source'}, 'junk']}, f)
+
+    assert migrate(json_path, db_path) == 3
+    snapshot = SqliteLoader()(db_path, db_signature(db_path))
+    assert snapshot.last_updated == '2026-10-03'
+    assert [item['title'] for item in snapshot.items] == ['a', 'b', 'c']
+    assert snapshot.items[0]['sentiment'] == 'neutral'
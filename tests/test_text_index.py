@@ -0,0 +1,24 @@
+import numpy as np
+
+from text_index import InvertedIndex, KeywordIndex
+
+TITLES = ['saldo terpotong lagi', 'transfer gagal', 'saldo tidak terpotong', 'gagal saldo', 'terpotong']
+SUMMARIES = ['', 'saldo terpotong dua kali', '', 'terpotong transfer', 'saldo']
+
+def search(query):
+    keywords = KeywordIndex({'title': TITLES, 'summary': SUMMARIES}, np.array([0]), len(TITLES))
+    rows, _ = InvertedIndex(keywords, len(TITLES)).search(query)
+    return sorted(rows.tolist())
+
+def test_phrase_needs_adjacent_terms_in_one_field():
+    assert search('saldo terpotong') == [0, 1, 2, 3, 4]
+    assert search('"saldo terpotong"') == [0, 1]
+
+def test_phrase_does_not_span_rows():
+    # Row 3's title ends with "saldo" and row 4's starts with "terpotong"
+    assert search('"gagal saldo"') == [3]
+    assert 3 not in search('"saldo terpotong"')
+
+def test_every_phrase_is_required():
+    assert search('"saldo terpotong" "transfer gagal"') == [1]
+    assert search('"saldo terpotong dua"') == [1]
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app import MAX_TREND_BUCKETS, build_trends
+from store import Snapshot
+
+START = date(2026, 9, 28)  # a Monday
+
+def item(day: int, sentiment: str = 'neutral', product: str = 'BRImo', feature: str = 'Transfer', when=None):
+    return {
+        'title': 't', 'source': 's', 'summary': 'x', 'type': 'complaint', 'sentiment': sentiment,
+        'product': product, 'feature': feature,
+        'date': when or (START + timedelta(days=day)).isoformat()
+    }
+
+def trends(items, granularity='day', start=None, end=None, **options):
+    snapshot = Snapshot((1, 1, 1), 'a', items)
+    response = build_trends(snapshot, start, end, None, None, None, granularity, **options)
+    return {(trend.product, trend.feature): [(point.date, point.count) for point in trend.data] for trend in response.trends}
+
+ITEMS = [item(0, 'positive'), item(1), item(1, 'negative'), item(9), item(35), item(2, product='Card', feature='Limit')]
+
+def test_week_and_month_buckets():
+    assert trends(ITEMS, 'week')[('BRImo', 'Transfer')] == [('2026-09-28', 3), ('2026-10-05', 1), ('2026-11-02', 1)]
+    assert trends(ITEMS, 'month')[('BRImo', 'Transfer')] == [('2026-09', 3), ('2026-10', 1), ('2026-11', 1)]
+    assert trends(ITEMS, 'month')[('Card', 'Limit')] == [('2026-09', 1)]
+
+def test_buckets_are_cut_off_at_the_date_range():
+    start = (START + timedelta(days=1)).toordinal()
+    end = (START + timedelta(days=9)).toordinal()
+    assert trends(ITEMS, 'week', start, end)[('BRImo', 'Transfer')] == [('2026-09-28', 2), ('2026-10-05', 1)]
+
+def test_gap_filling():
+    sparse = trends(ITEMS, 'week')[('BRImo', 'Transfer')]
+    filled = trends(ITEMS, 'week', fill_gaps=True)[('BRImo', 'Transfer')]
+    assert [label for label, count in filled if count] == [label for label, _ in sparse]
+    assert [label for label, _ in filled] == ['2026-09-28', '2026-10-05', '2026-10-12', '2026-10-19', '2026-10-26', '2026-11-02']
+    assert trends(ITEMS, 'day', fill_gaps=True)[('Card', 'Limit')][:3] == [('2026-09-28', 0), ('2026-09-29', 0), ('2026-09-30', 1)]
+
+def test_rolling_sentiment_spans_calendar_buckets():
+    snapshot = Snapshot((1, 1, 1), 'a', ITEMS)
+    response = build_trends(snapshot, None, None, None, None, 'BRImo', 'day', rolling=2)
+    points = response.trends[0].data
+    assert [(point.date, point.sentiment_score, point.rolling_sentiment) for point in points[:2]] == [
+        ('2026-09-28', 1.0, 1.0), ('2026-09-29', -0.5, 0.0)
+    ]
+    # Nothing in the day before 2026-10-07
+    assert (points[2].date, points[2].rolling_sentiment) == ('2026-10-07', 0.0)
+
+def test_stray_date_costs_one_day():
+    snapshot = Snapshot((1, 1, 1), 'a', ITEMS + [item(0, when='0201-03-01')])
+    daily = snapshot.store.trends
+    assert daily.count.shape == (2, len(daily.days) + 1)
+    assert len(daily.days) == 6
+
+    response = build_trends(snapshot, None, None, None, None, None, 'day')
+    assert response.trends[0].data[0].date == '0201-03-01'
+    with pytest.raises(HTTPException) as error:
+        build_trends(snapshot, None, None, None, None, None, 'day', fill_gaps=True)
+    assert error.value.status_code == 400
+    assert len(trends(ITEMS, 'day', fill_gaps=True)[('BRImo', 'Transfer')]) <= MAX_TREND_BUCKETS